@@ -54,6 +54,7 @@ function updateCardSize(width, height) {
 
     addOrUpdateRule(styleSheet, '.civmodelcard img', dimensionsKeyframes);
     addOrUpdateRule(styleSheet, '.civmodelcard .video-bg', dimensionsKeyframes);
+    addOrUpdateRule(styleSheet, '.civcard-placeholder img', dimensionsKeyframes);
     addOrUpdateRule(styleSheet, '.civmodelcard figcaption', textKeyframes);
 
     // Hide badges when tile size is less than 11
@@ -322,6 +323,141 @@ function attachVideoHoverPlay(card) {
     }
 })();
 
+// === Client-side card rendering ===
+// With "Client-side card rendering" on, the card list arrives as compact view-models
+// in its data-civcards attribute and is built here with the same markup as
+// _card_html() in civitai_api.py.
+const CIV_DELETE_SVG = '<svg viewBox="0 0 24 24" xmlns="http://www.w3.org/2000/svg" fill="currentColor"><path d="M6 19c0 1.1.9 2 2 2h8c1.1 0 2-.9 2-2V7H6v12zM19 4h-3.5l-1-1h-5l-1 1H5v2h14V4z"/></svg>';
+const CIV_EARLY_ACCESS_SVG = '<svg class="early-access-icon" viewBox="0 0 24 24" xmlns="http://www.w3.org/2000/svg" fill="currentColor"><path d="M13 2L3 14h9l-1 8 10-12h-8z"/></svg>';
+const CIV_NSFW_SVG = '<svg class="nsfw-badge-icon" viewBox="0 0 20 20" xmlns="http://www.w3.org/2000/svg" fill="currentColor"><circle cx="10" cy="10" r="10"/><text x="10" y="11" font-size="12" text-anchor="middle" dominant-baseline="middle" font-family="Arial" font-weight="bold" fill="#fff">!</text></svg>';
+const CIV_PLACEHOLDER_CARD = '<figure class="civcard-placeholder"><img src="data:image/gif;base64,R0lGODlhAQABAIAAAAAAAP///yH5BAEAAAAALAAAAAABAAEAAAIBRAA7" alt=""></figure>';
+
+function civEscape(value) {
+    return String(value ?? '')
+        .replace(/&/g, '&amp;')
+        .replace(/</g, '&lt;')
+        .replace(/>/g, '&gt;')
+        .replace(/"/g, '&quot;')
+        .replace(/'/g, '&#x27;');
+}
+
+function civCheckbox(modelString, type) {
+    return `<div class="checkbox-container">` +
+        `<input type="checkbox" class="model-checkbox" id="checkbox-${modelString}" ` +
+        `onchange="multi_model_select('${modelString}', '${civEscape(type)}', this.checked)">` +
+        `<label for="checkbox-${modelString}" class="custom-checkbox">` +
+        `<span class="checkbox-checkmark"></span>` +
+        `</label>` +
+        `</div>`;
+}
+
+function civCardHtml(v) {
+    const chars = Array.from(v.name);
+    const nameJs = v.name.replace(/'/g, "\\'");
+    const modelString = civEscape(`${nameJs} (${v.id})`);
+    const displayName = civEscape(chars.length > 35 ? chars.slice(0, 35).join('') + '...' : v.name);
+    const typeClass = civEscape(v.type.toLowerCase());
+    const sha256 = v.sha256 || '';
+
+    // Badges
+    const bmSuffix = v.baseShort
+        ? ` <span class="base-model-sep">|</span> <span class="base-model-short">${civEscape(v.baseShort)}</span>`
+        : '';
+    const typeBadge = v.earlyAccess
+        ? `<div class="model-type-badge ${typeClass} early-access-badge">${CIV_EARLY_ACCESS_SVG}${civEscape(v.typeLabel)}${bmSuffix}</div>`
+        : `<div class="model-type-badge ${typeClass}">${civEscape(v.typeLabel)}${bmSuffix}</div>`;
+    const statusBadge = v.badge
+        ? `<div class="status-badge ${v.badge}">${v.badge.charAt(0).toUpperCase()}${v.badge.slice(1)}</div>`
+        : '';
+    const nsfwBadge = v.nsfwBadge ? `<div class="nsfw-badge">${CIV_NSFW_SVG}NSFW</div>` : '';
+
+    // Header
+    const classes = `civmodelcard ${v.nsfw ? 'civcardnsfw' : ''} ${v.earlyAccess ? 'early-access' : ''} ${v.status}${v.favorite ? ' civcard-favorite' : ''}`;
+    let html = `<figure class="${classes}" ` +
+        `base-model="${civEscape(v.base)}" date="${civEscape(v.date)}" data-model-id="${v.id}" data-creator="${civEscape(v.creator)}" ` +
+        `onclick="select_model('${modelString}', event)">` +
+        `<div class="card-header">` +
+        `<div class="badges-container">${typeBadge}${statusBadge}${nsfwBadge}</div>`;
+
+    // Delete button for installed, delete + checkbox for outdated, checkbox otherwise
+    const deleteBtn = `<button class="delete-model-btn" ${sha256 ? `data-sha256="${sha256}"` : ''} data-model-name="${civEscape(nameJs)}" data-installed-count="${v.installedCount}" ` +
+        `onclick="deleteInstalledModel(event, '${modelString}', '${sha256}', ${v.installedCount})" title="Delete model">` +
+        `${CIV_DELETE_SVG}</button>`;
+    if (v.status === 'civmodelcardinstalled') {
+        html += `<div class="delete-button-container">${deleteBtn}</div>`;
+    } else if (v.status === 'civmodelcardoutdated') {
+        html += `<div class="outdated-card-actions">${deleteBtn}${civCheckbox(modelString, v.type)}</div>`;
+    } else {
+        html += civCheckbox(modelString, v.type);
+    }
+
+    // Footer
+    let media;
+    if (v.media === 'video') {
+        media = `<video class="video-bg" loop muted playsinline><source src="${civEscape(v.src)}" type="video/mp4"></video>`;
+    } else if (v.media) {
+        media = `<img src="${civEscape(v.src)}"></img>`;
+    } else {
+        media = `<img src="./file=html/card-no-preview.png" onerror="this.onerror=null;this.src='./file=html/card-no-preview.jpg';"></img>`;
+    }
+    html += `</div>${media}<figcaption title="${civEscape(v.name)}">${displayName}</figcaption></figure>`;
+    return html;
+}
+
+function renderCivitaiCards(list) {
+    let payload;
+    try {
+        payload = JSON.parse(list.getAttribute('data-civcards'));
+    } catch (e) {
+        console.error('[civitai] invalid card payload', e);
+        return;
+    } finally {
+        list.removeAttribute('data-civcards');
+    }
+
+    const parts = [];
+    if (payload.sections) {
+        parts.push('<div class="date-sections-container">');
+        for (const section of payload.sections) {
+            const count = section.cards.length;
+            const counter = count > 1 ? ` <span class="card-counter">${count}</span>` : '';
+            parts.push(`<div class="date-section"><h4>${civEscape(section.title)}${counter}</h4><div class="card-row">`);
+            section.cards.forEach((card) => parts.push(civCardHtml(card)));
+            parts.push('</div></div>');
+        }
+        parts.push('</div>');
+    } else {
+        (payload.cards || []).forEach((card) => parts.push(civCardHtml(card)));
+    }
+    parts.push(CIV_PLACEHOLDER_CARD.repeat(payload.placeholders || 0));
+    list.innerHTML = parts.join('');
+}
+
+// Render card lists as soon as Gradio injects them into the browser grid.
+// Only observed while client-side rendering is enabled.
+let civCardObserver = null;
+
+function initClientCardRenderer() {
+    const enabled = typeof opts !== 'undefined' && opts.civitai_neo_client_render;
+    if (!enabled) {
+        if (civCardObserver) {
+            civCardObserver.disconnect();
+            civCardObserver = null;
+        }
+        return;
+    }
+    const container = gradioApp().querySelector('#civitai_list_html');
+    if (civCardObserver || !container) return;
+
+    const render = () => container.querySelectorAll('.civmodellist[data-civcards]').forEach(renderCivitaiCards);
+    civCardObserver = new MutationObserver(render);
+    civCardObserver.observe(container, { childList: true, subtree: true });
+    render();
+}
+
+onUiLoaded(initClientCardRenderer);
+onOptionsChanged(initClientCardRenderer);
+
 // Enables refresh with alt+enter and ctrl+enter
 function keydownHandler(e) {
     var handled = false;
@@ -0,0 +1,197 @@
+"""
+API Response Cache  —  neo_api_cache.db
+
+Persistent cache of CivitAI API JSON responses, consulted by request_civit_api()
+before going to the network, so paging back and forth, reopening a search or
+re-running an update scan is answered locally.
+
+One row per (url, API key):
+  key                      url, prefixed with a short hash of the API key when
+                           one is set (results differ per account: NSFW,
+                           early access, hidden models…)
+  body                     zlib-compressed response bytes
+  etag, last_modified      validators sent back as If-None-Match /
+                           If-Modified-Since once the entry is stale
+  stored_at, accessed_at   freshness (per-endpoint TTL) and LRU order
+
+Lifecycle:
+  fresh    →  served without a request
+  stale    →  revalidated: 304 refreshes stored_at, 200 replaces the body
+  too big  →  least recently used rows are evicted until the cache fits
+              civitai_neo_api_cache_size (MB)
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from urllib.parse import urlparse
+
+from modules.shared import opts
+
+from scripts.civitai_global import debug_print
+
+_DB_FILE = None  # Resolved lazily to survive module-level import order
+_conn = None
+_lock = threading.Lock()
+
+# (path prefix, TTL in seconds) — first match wins, unknown endpoints are not cached
+_ENDPOINT_TTLS = (
+    ('/api/v1/model-versions/by-hash/', 6 * 3600),  # Hash → version never changes, only stats do
+    ('/api/v1/model-versions/', 3600),
+    ('/api/v1/models/', 1800),                      # Single model by id
+    ('/api/v1/models', 600),                        # Search pages, ?ids= lookups
+)
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS responses (
+    key           TEXT PRIMARY KEY,
+    body          BLOB NOT NULL,
+    size          INTEGER NOT NULL,
+    etag          TEXT,
+    last_modified TEXT,
+    stored_at     REAL NOT NULL,
+    accessed_at   REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed_at);
+'''
+
+
+def _get_db_path():
+    global _DB_FILE
+    if _DB_FILE is None:
+        config_folder = os.path.join(os.getcwd(), 'config_states')
+        os.makedirs(config_folder, exist_ok=True)
+        _DB_FILE = os.path.join(config_folder, 'neo_api_cache.db')
+    return _DB_FILE
+
+
+def _get_conn():
+    global _conn
+    if _conn is None:
+        _conn = sqlite3.connect(_get_db_path(), check_same_thread=False)
+        _conn.execute('PRAGMA journal_mode=WAL')
+        _conn.execute('PRAGMA synchronous=NORMAL')
+        _conn.executescript(_SCHEMA)
+    return _conn
+
+
+def _enabled():
+    return getattr(opts, 'civitai_neo_api_cache', True)
+
+
+def _max_bytes():
+    return int(getattr(opts, 'civitai_neo_api_cache_size', 64)) * 1024 * 1024
+
+
+def ttl_for(url):
+    """Seconds an API response stays fresh, 0 when the endpoint is not cached."""
+    path = urlparse(url or '').path
+    for prefix, ttl in _ENDPOINT_TTLS:
+        if path.startswith(prefix):
+            return ttl
+    return 0
+
+
+def _cache_key(url, headers):
+    auth = (headers or {}).get('Authorization')
+    if not auth:
+        return url
+    return f"{hashlib.sha256(auth.encode('utf-8')).hexdigest()[:16]}|{url}"
+
+
+# ─── Public API ───────────────────────────────────────────────────────────────
+
+def lookup(url, headers=None):
+    """
+    Cached response for url, or None.
+    Returns dict: body (bytes), fresh (bool), etag, last_modified.
+    Stale entries are returned too, for revalidation.
+    """
+    ttl = ttl_for(url)
+    if not ttl or not _enabled():
+        return None
+    key = _cache_key(url, headers)
+    now = time.time()
+    try:
+        with _lock:
+            conn = _get_conn()
+            row = conn.execute(
+                'SELECT body, etag, last_modified, stored_at FROM responses WHERE key = ?', (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute('UPDATE responses SET accessed_at = ? WHERE key = ?', (now, key))
+            conn.commit()
+        body, etag, last_modified, stored_at = row
+        return {
+            'body': zlib.decompress(body),
+            'fresh': now - stored_at < ttl,
+            'etag': etag,
+            'last_modified': last_modified,
+        }
+    except (sqlite3.Error, zlib.error) as e:
+        debug_print(f"API cache lookup failed: {e}")
+        return None
+
+
+def conditional_headers(entry):
+    """If-None-Match / If-Modified-Since headers for revalidating a stale entry."""
+    headers = {}
+    if entry and entry.get('etag'):
+        headers['If-None-Match'] = entry['etag']
+    if entry and entry.get('last_modified'):
+        headers['If-Modified-Since'] = entry['last_modified']
+    return headers
+
+
+def store(url, headers, body, etag=None, last_modified=None):
+    """Cache a successful response body, then evict LRU rows beyond the size cap."""
+    if not body or not ttl_for(url) or not _enabled():
+        return
+    key = _cache_key(url, headers)
+    blob = zlib.compress(body, 1)
+    now = time.time()
+    try:
+        with _lock:
+            conn = _get_conn()
+            conn.execute(
+                'INSERT OR REPLACE INTO responses (key, body, size, etag, last_modified, stored_at, accessed_at) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (key, blob, len(blob), etag, last_modified, now, now)
+            )
+            _evict(conn, _max_bytes())
+            conn.commit()
+    except sqlite3.Error as e:
+        debug_print(f"API cache store failed: {e}")
+
+
+def revalidated(url, headers):
+    """Mark an entry fresh again after a 304 Not Modified."""
+    key = _cache_key(url, headers)
+    try:
+        with _lock:
+            conn = _get_conn()
+            conn.execute('UPDATE responses SET stored_at = ? WHERE key = ?', (time.time(), key))
+            conn.commit()
+    except sqlite3.Error as e:
+        debug_print(f"API cache update failed: {e}")
+
+
+# ─── Eviction ─────────────────────────────────────────────────────────────────
+
+def _evict(conn, max_bytes):
+    total = conn.execute('SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+    if total <= max_bytes:
+        return
+    freed = 0
+    doomed = []
+    for key, size in conn.execute('SELECT key, size FROM responses ORDER BY accessed_at'):
+        if total - freed <= max_bytes:
+            break
+        doomed.append((key,))
+        freed += size
+    conn.executemany('DELETE FROM responses WHERE key = ?', doomed)
+    debug_print(f"API cache: evicted {len(doomed)} entries ({freed // 1024} KB)")
@@ -0,0 +1,186 @@
+"""
+Batched By-Hash Lookups
+
+Collects concurrent /api/v1/model-versions/by-hash lookups for a short window
+and resolves them with as few requests as the API allows:
+
+  1 hash pending      →  GET  {base}/api/v1/model-versions/by-hash/{sha256}
+  2…max_batch hashes  →  POST {base}/api/v1/model-versions/by-hash  [sha256, …]
+                         every file hash of each returned version is matched
+                         back to the callers; hashes without a match are 404
+  first misses on a host  →  one of them is checked with a GET: a 404 marks the
+                         host's batch answers as complete, a hit marks them
+                         partial, and from then on that host's misses are
+                         resolved by their callers' own GETs
+  batch not accepted  →  the host is remembered as GET-only and every caller
+                         falls back to its own per-hash GET
+
+The first caller of a window leads it: it waits until the batch is full, stops
+growing for `idle` seconds or the window ends, sends the request and wakes the
+others. No background threads. Callers only share a batch when they pass the
+same headers and send kwargs (timeout, proxies, verify…).
+
+Plain Python (no WebUI imports): the caller injects the send function, so the
+same client runs against CivitAI inside the extension and against
+tools/by_hash_stub.py for offline benchmarks.
+"""
+
+import threading
+import time
+
+BY_HASH_PATH = '/api/v1/model-versions/by-hash'
+
+# Responses to the batch POST meaning "not supported here" (not a lookup failure)
+_NO_BATCH_STATUS = (400, 404, 405, 415, 501)
+
+
+class _Batch:
+    def __init__(self, base_url, headers, send_kwargs):
+        self.base_url = base_url
+        self.headers = headers
+        self.send_kwargs = send_kwargs
+        self.hashes = []
+        self.full = threading.Event()
+        self.done = threading.Event()
+        self.results = {}      # SHA256 (upper) -> (status_code, data, batched)
+        self.error = None      # Exception raised by the shared request
+        self.fallback = False  # Every caller does its own GET
+        self.partial = False   # Callers missing from the results do their own GET
+
+
+class ByHashBatcher:
+    """
+    send(method, url, **kwargs) must return a response object with
+    .status_code and .json() (requests.Response, or anything alike).
+    lookup() returns (status_code, data); data is the version dict on 200.
+    lookup_with_source() also tells whether data came from the batch POST,
+    whose versions may be slimmer than a per-hash GET's.
+    Network exceptions raised by send() reach every caller of the batch.
+    """
+
+    def __init__(self, send, window=0.05, idle=0.01, max_batch=100):
+        self.send = send
+        self.window = window
+        self.idle = idle
+        self.max_batch = max_batch
+        self._lock = threading.Lock()
+        self._open = {}         # (base_url, headers) -> _Batch still collecting
+        self._get_only = set()  # Hosts that rejected the batch POST
+        self._complete = set()  # Hosts whose batch answers list every known hash
+        self._partial = set()   # Hosts whose batch answers left out a known hash
+
+    def lookup(self, base_url, sha256, headers=None, **send_kwargs):
+        status, data, _ = self.lookup_with_source(base_url, sha256, headers, **send_kwargs)
+        return status, data
+
+    def lookup_with_source(self, base_url, sha256, headers=None, **send_kwargs):
+        """(status_code, data, batched) — batched is True when data came from the POST."""
+        base_url = base_url.rstrip('/')
+        sha = str(sha256).strip().upper()
+        if base_url in self._get_only or self.max_batch < 2:
+            return self._get_one(base_url, sha, headers, send_kwargs)
+
+        key = (
+            base_url,
+            tuple(sorted((headers or {}).items())),
+            tuple(sorted((name, repr(value)) for name, value in send_kwargs.items())),
+        )
+        with self._lock:
+            batch = self._open.get(key)
+            leader = batch is None
+            if leader:
+                batch = _Batch(base_url, headers, send_kwargs)
+                self._open[key] = batch
+            if sha not in batch.hashes:
+                batch.hashes.append(sha)
+            if len(batch.hashes) >= self.max_batch:
+                self._open.pop(key, None)
+                batch.full.set()
+
+        if leader:
+            self._collect(batch)
+            with self._lock:
+                if self._open.get(key) is batch:
+                    del self._open[key]
+            self._run(batch)
+        else:
+            batch.done.wait()
+
+        if batch.error is not None:
+            raise batch.error
+        if batch.fallback or (batch.partial and sha not in batch.results):
+            return self._get_one(base_url, sha, headers, send_kwargs)
+        return batch.results.get(sha, (404, None, True))
+
+    def _collect(self, batch):
+        deadline = time.monotonic() + self.window
+        seen = 0
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or batch.full.wait(min(self.idle, remaining)):
+                return
+            with self._lock:
+                count = len(batch.hashes)
+            if count == seen:
+                return
+            seen = count
+
+    # ─── Requests ─────────────────────────────────────────────────────────────
+
+    def _get_one(self, base_url, sha, headers, send_kwargs):
+        response = self.send('GET', f"{base_url}{BY_HASH_PATH}/{sha}", headers=headers, **send_kwargs)
+        data = response.json() if response.status_code == 200 else None
+        return response.status_code, data, False
+
+    def _run(self, batch):
+        try:
+            if len(batch.hashes) == 1:
+                sha = batch.hashes[0]
+                batch.results[sha] = self._get_one(batch.base_url, sha, batch.headers, batch.send_kwargs)
+                return
+            response = self.send('POST', f"{batch.base_url}{BY_HASH_PATH}", json=batch.hashes,
+                                 headers=batch.headers, **batch.send_kwargs)
+            if response.status_code in _NO_BATCH_STATUS:
+                self._get_only.add(batch.base_url)
+                batch.fallback = True
+                return
+            if response.status_code != 200:
+                for sha in batch.hashes:
+                    batch.results[sha] = (response.status_code, None, True)
+                return
+            versions = response.json()
+            if not isinstance(versions, list):
+                self._get_only.add(batch.base_url)
+                batch.fallback = True
+                return
+            wanted = set(batch.hashes)
+            for version in versions:
+                if not isinstance(version, dict):
+                    continue
+                for file in version.get('files', []) or []:
+                    file_sha = str((file.get('hashes') or {}).get('SHA256', '')).upper()
+                    if file_sha in wanted and file_sha not in batch.results:
+                        batch.results[file_sha] = (200, version, True)
+            self._check_misses(batch)
+        except Exception as e:
+            batch.error = e
+        finally:
+            batch.done.set()
+
+    def _check_misses(self, batch):
+        """Decide once per host whether its batch misses are real 404s."""
+        missing = [sha for sha in batch.hashes if sha not in batch.results]
+        if not missing or batch.base_url in self._complete:
+            return
+        if batch.base_url not in self._partial:
+            sha = missing[0]
+            batch.results[sha] = self._get_one(batch.base_url, sha, batch.headers, batch.send_kwargs)
+            status = batch.results[sha][0]
+            if status == 404:
+                self._complete.add(batch.base_url)
+                return
+            if status != 200:
+                batch.partial = True  # Undecided: let this batch's callers check for themselves
+                return
+            self._partial.add(batch.base_url)
+        batch.partial = True
@@ -1,15 +1,19 @@
 import urllib.parse
-import time
+import threading
+import copy
+import itertools
 import requests
 import platform
+import pickle
 import json
 import os
 import re
 import gradio as gr
 from datetime import datetime, timezone
-from collections import defaultdict
+from collections import defaultdict, namedtuple, OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait
 from pathlib import Path
-from html import escape
+from html import escape, unescape
 from io import BytesIO
 from PIL import Image
 
@@ -22,6 +26,9 @@ from modules.shared import cmd_opts, opts
 import scripts.civitai_download as _download
 import scripts.civitai_file_manage as _file
 import scripts.civitai_global as gl
+import scripts.model_index as _index
+import scripts.civitai_http as _http
+import scripts.api_cache as _api_cache
 from scripts.civitai_global import print, debug_print
 
 
@@ -236,26 +243,77 @@ def normalize_sha256(sha256_hash):
         return None
     return sha256_hash.strip().upper()
 
+# Process-wide LRU of parsed JSON files (sidecars, api_info, configs).
+# Key: absolute path -> (mtime_ns, size, pickled data). Entries are validated with a
+# single os.stat per read and invalidated by safe_json_save on every write.
+# Pickled blobs hand every caller its own copy, so callers may mutate the result freely.
+_JSON_CACHE_MAX_BYTES = 64 * 1024 * 1024
+_json_cache = OrderedDict()
+_json_cache_bytes = 0
+_json_cache_lock = threading.Lock()
+
+def _json_cache_put(key, st, data):
+    global _json_cache_bytes
+    try:
+        blob = pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+    except Exception:
+        return
+    with _json_cache_lock:
+        old = _json_cache.pop(key, None)
+        if old:
+            _json_cache_bytes -= len(old[2])
+        _json_cache[key] = (st.st_mtime_ns, st.st_size, blob)
+        _json_cache_bytes += len(blob)
+        while _json_cache_bytes > _JSON_CACHE_MAX_BYTES and _json_cache:
+            _, evicted = _json_cache.popitem(last=False)
+            _json_cache_bytes -= len(evicted[2])
+
+def _json_cache_drop(key):
+    global _json_cache_bytes
+    with _json_cache_lock:
+        old = _json_cache.pop(key, None)
+        if old:
+            _json_cache_bytes -= len(old[2])
+
 def safe_json_load(file_path):
-    """Safely load JSON file with error handling"""
-    if not os.path.exists(file_path):
+    """Safely load JSON file with error handling (memoized by path + mtime + size)"""
+    key = os.path.abspath(str(file_path))
+    try:
+        st = os.stat(key)
+    except OSError:
+        _json_cache_drop(key)
         return None
+    with _json_cache_lock:
+        hit = _json_cache.get(key)
+        if hit and hit[0] == st.st_mtime_ns and hit[1] == st.st_size:
+            _json_cache.move_to_end(key)
+            blob = hit[2]
+        else:
+            blob = None
+    if blob is not None:
+        return pickle.loads(blob)
     try:
         with open(file_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+            data = json.load(f)
     except Exception as e:
         print(f"Error loading JSON from {file_path}: {e}")
         return None
+    _json_cache_put(key, st, data)
+    return data
 
 def safe_json_save(file_path, data):
     """Safely save JSON file with error handling"""
+    key = os.path.abspath(str(file_path))
     try:
         # Create directory if it doesn't exist
         os.makedirs(os.path.dirname(file_path), exist_ok=True)
         with open(file_path, 'w', encoding='utf-8') as f:
             json.dump(data, f, indent=4, ensure_ascii=False)
+        _json_cache_drop(key)
+        _index.refresh_path(file_path)
         return True
     except Exception as e:
+        _json_cache_drop(key)
         print(f"Error saving JSON to {file_path}: {e}")
         return False
 
@@ -451,7 +509,238 @@ def update_mode_page_html(content_type_filter, base_filter, tile_count, current_
             current_page > 1, current_page < total_pages)
 
 
+# Process-wide LRU of rendered browser cards (model_list_html → get_model_card).
+# Key: model id, version ids, which of its files are installed, favorite creator,
+# status badge and the display options the card reads, so a card is rebuilt only
+# when something it shows has changed. Values are [view, html] pairs; the html is
+# filled in on first server-side use (client-side rendering only needs the view).
+_CARD_CACHE_MAX = 2048
+_card_cache = OrderedDict()
+_card_cache_lock = threading.Lock()
+
+# Settings a browser card reads, snapshotted once per model_list_html() call
+# (immutable and hashable, so it doubles as part of the card cache key)
+CardOptions = namedtuple('CardOptions', 'status_badges resize_preview resize_size precise_check nsfw_badge')
+_WIDTH_RE = re.compile(r'/width=\d+')
+
+def _card_display_options():
+    return CardOptions(
+        status_badges=getattr(opts, 'show_civitai_status_badges', True),
+        resize_preview=getattr(opts, 'resize_preview_cards', True),
+        resize_size=getattr(opts, 'resize_preview_size', 512),
+        precise_check=getattr(opts, 'precise_version_check', True),
+        nsfw_badge=getattr(opts, 'show_nsfw_badge', True),
+    )
+
+def _card_cache_key(item, existing_files, existing_files_sha256, favorite_creators, display_options):
+    versions = item.get('modelVersions', [])
+    installed = []
+    for version in versions:
+        for file in version.get('files', []):
+            file_name = file['name'].lower()
+            file_sha256 = normalize_sha256(file.get('hashes', {}).get('SHA256', ''))
+            if file_name in existing_files or (file_sha256 and file_sha256 in existing_files_sha256):
+                installed.append((version.get('id'), file_sha256 or file_name))
+    creator = ((item.get('creator', {}) or {}).get('username', '') or '').strip()
+    # Everything the card shows per version: name, base model, date, early
+    # access flag and the preview (first image url + media type)
+    version_state = []
+    for version in versions:
+        first_image = (version.get('images') or [{}])[0]
+        version_state.append((
+            version.get('id'),
+            version.get('name', ''),
+            version.get('baseModel'),
+            version.get('publishedAt'),
+            version.get('availability'),
+            first_image.get('type'),
+            first_image.get('url'),
+        ))
+    return (
+        item.get('id'),
+        item.get('name', ''),
+        item.get('type'),
+        is_model_nsfw(item),
+        tuple(version_state),
+        tuple(installed),
+        creator in favorite_creators,
+        get_status_badge_type(item) if display_options.status_badges else '',
+        display_options,
+    )
+
+def _card_cache_get(key):
+    with _card_cache_lock:
+        hit = _card_cache.get(key)
+        if hit is not None:
+            _card_cache.move_to_end(key)
+        return hit
+
+def _card_cache_put(key, card):
+    with _card_cache_lock:
+        _card_cache[key] = card
+        _card_cache.move_to_end(key)
+        while len(_card_cache) > _CARD_CACHE_MAX:
+            _card_cache.popitem(last=False)
+
+
+def _card_html(view):
+    """Build HTML for a single model card (civmodelcard - Browser Card) from its view-model"""
+    model_id = view['id']
+    model_name = view['name']
+    model_type = view['type']
+    base_model = view['base']
+    date = view['date']
+    model_uploader_card = view['creator']
+    installstatus = view['status']
+    installed_file_sha256 = view['sha256']
+    installed_versions_count = view['installedCount']
+    base_model_short = view['baseShort']
+    status_badge_type = view['badge']
+    early_access = view['earlyAccess']
+    type_label = view['typeLabel']
+    nsfw_class = 'civcardnsfw' if view['nsfw'] else ''
+    early_access_class = 'early-access' if early_access else ''
+    fav_class = ' civcard-favorite' if view['favorite'] else ''
+
+    image_url = view['src']
+    if view['media'] == 'video':
+        imgtag = f'<video class="video-bg" loop muted playsinline><source src="{image_url}" type="video/mp4"></video>'
+    elif view['media']:
+        imgtag = f'<img src="{image_url}"></img>'
+    else:
+        # Try PNG first, then fallback to JPEG if PNG does not exist
+        imgtag = '<img src="./file=html/card-no-preview.png" onerror="this.onerror=null;this.src=\'./file=html/card-no-preview.jpg\';"></img>'
+
+    # Model name for JS and HTML
+    model_name_js = model_name.replace("'", "\\'")
+    model_string = escape(f"{model_name_js} ({model_id})")
+    display_name = escape(model_name[:35] + '...' if len(model_name) > 35 else model_name)
+    full_name = escape(model_name)
+
+    ## Badges
+    # Base model suffix for type badge (e.g. "| IL")
+    bm_suffix = (
+        f' <span class="base-model-sep">|</span>'
+        f' <span class="base-model-short">{base_model_short}</span>'
+    ) if base_model_short else ''
+
+    # Model Type Badge ( + Early Access + base model abbreviation)
+    if early_access:
+        # Gold badge with a lightning icon
+        model_type_badge = (
+            f'<div class="model-type-badge {model_type.lower()} early-access-badge">'
+            '<svg class="early-access-icon" viewBox="0 0 24 24" xmlns="http://www.w3.org/2000/svg" fill="currentColor">'
+            '<path d="M13 2L3 14h9l-1 8 10-12h-8z"/>'
+            '</svg>'
+            f'{type_label}{bm_suffix}'
+            '</div>'
+        )
+    else:
+        model_type_badge = f'<div class="model-type-badge {model_type.lower()}">{type_label}{bm_suffix}</div>'
+
+    # Status Badge (New / Updated)
+    if status_badge_type:
+        status_badge = f'<div class="status-badge {status_badge_type}">{status_badge_type.capitalize()}</div>'
+    else:
+        status_badge = ''
+
+    # NSFW Badge - only show for nsfw cards and if setting is enabled
+    if view['nsfwBadge']:
+        nsfw_badge = (
+            '<div class="nsfw-badge">'
+            '<svg class="nsfw-badge-icon" viewBox="0 0 20 20" xmlns="http://www.w3.org/2000/svg" fill="currentColor">'
+            '<circle cx="10" cy="10" r="10"/>'
+            '<text x="10" y="11" font-size="12" text-anchor="middle" dominant-baseline="middle" font-family="Arial" font-weight="bold" fill="#fff">!</text>'
+            '</svg>'
+            'NSFW'
+            '</div>'
+        )
+    else:
+        nsfw_badge = ''
+
+    # ModelCard HTML (Header)
+    card_html = (
+        f'<figure class="civmodelcard {nsfw_class} {early_access_class} {installstatus}{fav_class}" '
+        f'base-model="{base_model}" date="{date}" data-model-id="{model_id}" data-creator="{escape(model_uploader_card)}" '
+        f'onclick="select_model(\'{model_string}\', event)">'
+        f'<div class="card-header">'
+        f'<div class="badges-container">{model_type_badge}{status_badge}{nsfw_badge}</div>'
+    )
+
+    # Show delete button for up-to-date installed models;
+    # For outdated: both delete (hidden below tile size 11) + checkbox stacked
+    # For non-installed: checkbox only
+    if installstatus == 'civmodelcardinstalled':
+        sha256_attr = f'data-sha256="{installed_file_sha256}"' if installed_file_sha256 else ''
+        card_html += (
+            f'<div class="delete-button-container">'
+            f'<button class="delete-model-btn" {sha256_attr} data-model-name="{model_name_js}" data-installed-count="{installed_versions_count}" '
+            f'onclick="deleteInstalledModel(event, \'{model_string}\', \'{installed_file_sha256 or ""}\', {installed_versions_count})" title="Delete model">'
+            f'<svg viewBox="0 0 24 24" xmlns="http://www.w3.org/2000/svg" fill="currentColor">'
+            f'<path d="M6 19c0 1.1.9 2 2 2h8c1.1 0 2-.9 2-2V7H6v12zM19 4h-3.5l-1-1h-5l-1 1H5v2h14V4z"/>'
+            f'</svg>'
+            f'</button>'
+            f'</div>'
+        )
+    elif installstatus == 'civmodelcardoutdated':
+        # Both delete (hides at tile < 11) + checkbox for batch update selection
+        sha256_attr = f'data-sha256="{installed_file_sha256}"' if installed_file_sha256 else ''
+        card_html += (
+            f'<div class="outdated-card-actions">'
+            f'<button class="delete-model-btn" {sha256_attr} data-model-name="{model_name_js}" data-installed-count="{installed_versions_count}" '
+            f'onclick="deleteInstalledModel(event, \'{model_string}\', \'{installed_file_sha256 or ""}\', {installed_versions_count})" title="Delete model">'
+            f'<svg viewBox="0 0 24 24" xmlns="http://www.w3.org/2000/svg" fill="currentColor">'
+            f'<path d="M6 19c0 1.1.9 2 2 2h8c1.1 0 2-.9 2-2V7H6v12zM19 4h-3.5l-1-1h-5l-1 1H5v2h14V4z"/>'
+            f'</svg>'
+            f'</button>'
+            f'<div class="checkbox-container">'
+            f'<input type="checkbox" class="model-checkbox" id="checkbox-{model_string}" '
+            f'onchange="multi_model_select(\'{model_string}\', \'{model_type}\', this.checked)">'
+            f'<label for="checkbox-{model_string}" class="custom-checkbox">'
+            f'<span class="checkbox-checkmark"></span>'
+            f'</label>'
+            f'</div>'
+            f'</div>'
+        )
+    else:
+        # Non-installed: checkbox for batch download
+        card_html += (
+            f'<div class="checkbox-container">'
+            f'<input type="checkbox" class="model-checkbox" id="checkbox-{model_string}" '
+            f'onchange="multi_model_select(\'{model_string}\', \'{model_type}\', this.checked)">'
+            f'<label for="checkbox-{model_string}" class="custom-checkbox">'
+            f'<span class="checkbox-checkmark"></span>'
+            f'</label>'
+            f'</div>'
+        )
+
+    # ModelCard HTML (Footer)
+    card_html += (
+        f'</div>'
+        f'{imgtag}'
+        f'<figcaption title="{full_name}">{display_name}</figcaption></figure>'
+    )
+    return card_html
+
+
+
 def model_list_html(json_data):
+    """Card grid HTML for a page of API items (the final step of model_list_html_steps)."""
+    for html, _ in model_list_html_steps(json_data):
+        pass
+    return html
+
+
+# Local install lookups run here while a streamed grid renders its first cards
+_index_lookup_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix='neo-index-lookup')
+
+def model_list_html_steps(json_data, stream_batch=0):
+    """
+    Yields (html, final). With stream_batch, the local index is queried in the
+    background while cards render as not installed: every stream_batch cards a
+    partial grid (rest as placeholders) is yielded, until the index answers.
+    The final grid, with install state, is always the last step.
+    """
     def filter_versions(item, hide_early_access, current_time):
         """Filter model versions based on file presence and early access status"""
         versions = []
@@ -465,35 +754,18 @@ def model_list_html(json_data):
 
     def collect_existing_files(model_folders):
         """Collect existing file names and SHA256 hashes from model folders"""
-        files_set = set()
-        sha256_set = set()
-        for folder in model_folders:
-            if folder is None:
-                continue
-            for root, _, files in os.walk(folder, followlinks=True):
-                for file in files:
-                    files_set.add(file.lower())
-                    if file.endswith('.json'):
-                        json_path = os.path.join(root, file)
-                        json_data = safe_json_load(json_path)
-                        if json_data and isinstance(json_data, dict):
-                            sha256 = normalize_sha256(json_data.get('sha256'))
-                            if sha256:
-                                sha256_set.add(sha256)
-        return files_set, sha256_set
+        return _index.existing_files(model_folders)
 
     ## === ANXETY EDITs ===
-    def get_model_card(item, existing_files, existing_files_sha256, playback, favorite_creators):
+    def get_model_card(item, existing_files, existing_files_sha256, playback, favorite_creators, options):
         """Build HTML for a single model card (civmodelcard - Browser Card)"""
         model_id = item.get('id')
         model_name = item.get('name', '')
         is_nsfw = is_model_nsfw(item)
-        nsfw_class = 'civcardnsfw' if is_nsfw else ''
 
         # Creator info for favorite/ban display
         _creator_data = item.get('creator', {}) or {}
         model_uploader_card = (_creator_data.get('username', '') or '').strip()
-        fav_class = ' civcard-favorite' if model_uploader_card in favorite_creators else ''
 
         # Find the first installed version or fallback to the first version
         display_version = None
@@ -524,10 +796,9 @@ def model_list_html(json_data):
             date = 'Not Found'
 
         early_access = is_early_access(display_version) if display_version else False
-        early_access_class = 'early-access' if early_access else ''
 
         # Status badges: New / Updated + base model abbreviation (optional setting)
-        show_status_badges = getattr(opts, 'show_civitai_status_badges', True)
+        show_status_badges = options.status_badges
         if show_status_badges:
             base_model_short = get_base_model_short(base_model)
             status_badge_type = get_status_badge_type(item)
@@ -537,33 +808,31 @@ def model_list_html(json_data):
 
         # Image or video preview
         images = display_version.get('images', []) if display_version else []
+        media_type = ''
+        image_url = ''
         if images:
             media_type = images[0].get('type')
             image_url = images[0].get('url')
 
             # Apply resize if enabled
-            resize_preview = getattr(opts, 'resize_preview_cards', True)
-            resize_size = getattr(opts, 'resize_preview_size', 512)
+            resize_preview = options.resize_preview
+            resize_size = options.resize_size
 
             if resize_preview and media_type == 'image':
                 # For images, modify the URL to request specific size
-                image_url = re.sub(r'/width=\d+', f"/width={resize_size}", image_url)
+                image_url = _WIDTH_RE.sub(f"/width={resize_size}", image_url)
 
             if media_type == 'video':
                 if resize_preview:
                     # For videos, replace or add width parameter
                     if '/width=' in image_url:
-                        image_url = re.sub(r'/width=\d+', f"/width={resize_size}", image_url)
+                        image_url = _WIDTH_RE.sub(f"/width={resize_size}", image_url)
                     else:
                         image_url = image_url.replace('transcode=true,', f"transcode=true,width={resize_size},")
                 else:
                     image_url = image_url.replace('width=', 'transcode=true,width=')
-                imgtag = f'<video class="video-bg" loop muted playsinline><source src="{image_url}" type="video/mp4"></video>'
             else:
-                imgtag = f'<img src="{image_url}"></img>'
-        else:
-            # Try PNG first, then fallback to JPEG if PNG does not exist
-            imgtag = '<img src="./file=html/card-no-preview.png" onerror="this.onerror=null;this.src=\'./file=html/card-no-preview.jpg\';"></img>'
+                media_type = 'image'
 
         # Install status - check if model is installed and determine if it's outdated
         # Dual-strategy: API order (primary) + regex fallback (failsafe).
@@ -571,9 +840,10 @@ def model_list_html(json_data):
         # Regex is used as a secondary check to catch edge cases the API might miss.
         installstatus = ''
         installed_file_sha256 = None  # Track SHA256 of installed file for delete functionality
+        installed_versions_count = 0
         model_versions = item.get('modelVersions', [])
         if model_versions:
-            precise_check = getattr(opts, 'precise_version_check', True)
+            precise_check = options.precise_check
             installed_versions_found = set()
 
             # === PRIMARY: API order + baseModel ===
@@ -689,117 +959,28 @@ def model_list_html(json_data):
                 if len(shorts) > 1:
                     base_model_short = ' · '.join(shorts)
 
-        # Model name for JS and HTML
-        model_name_js = model_name.replace("'", "\\'")
-        model_string = escape(f"{model_name_js} ({model_id})")
-        display_name = escape(model_name[:35] + '...' if len(model_name) > 35 else model_name)
-        full_name = escape(model_name)
-
-        ## Badges
-        # Base model suffix for type badge (e.g. "| IL")
-        bm_suffix = (
-            f' <span class="base-model-sep">|</span>'
-            f' <span class="base-model-short">{base_model_short}</span>'
-        ) if base_model_short else ''
-
-        # Model Type Badge ( + Early Access + base model abbreviation)
-        if early_access:
-            # Gold badge with a lightning icon
-            model_type_badge = (
-                f'<div class="model-type-badge {item["type"].lower()} early-access-badge">'
-                '<svg class="early-access-icon" viewBox="0 0 24 24" xmlns="http://www.w3.org/2000/svg" fill="currentColor">'
-                '<path d="M13 2L3 14h9l-1 8 10-12h-8z"/>'
-                '</svg>'
-                f'{get_display_type(item["type"])}{bm_suffix}'
-                '</div>'
-            )
-        else:
-            model_type_badge = f'<div class="model-type-badge {item["type"].lower()}">{get_display_type(item["type"])}{bm_suffix}</div>'
-
-        # Status Badge (New / Updated)
-        if status_badge_type:
-            status_badge = f'<div class="status-badge {status_badge_type}">{status_badge_type.capitalize()}</div>'
-        else:
-            status_badge = ''
-
-        # NSFW Badge - only show for nsfw cards and if setting is enabled
-        show_nsfw_badge = getattr(opts, 'show_nsfw_badge', True)
-        if is_nsfw and show_nsfw_badge:
-            nsfw_badge = (
-                '<div class="nsfw-badge">'
-                '<svg class="nsfw-badge-icon" viewBox="0 0 20 20" xmlns="http://www.w3.org/2000/svg" fill="currentColor">'
-                '<circle cx="10" cy="10" r="10"/>'
-                '<text x="10" y="11" font-size="12" text-anchor="middle" dominant-baseline="middle" font-family="Arial" font-weight="bold" fill="#fff">!</text>'
-                '</svg>'
-                'NSFW'
-                '</div>'
-            )
-        else:
-            nsfw_badge = ''
-
-        # ModelCard HTML (Header)
-        card_html = (
-            f'<figure class="civmodelcard {nsfw_class} {early_access_class} {installstatus}{fav_class}" '
-            f'base-model="{base_model}" date="{date}" data-model-id="{model_id}" data-creator="{escape(model_uploader_card)}" '
-            f'onclick="select_model(\'{model_string}\', event)">'
-            f'<div class="card-header">'
-            f'<div class="badges-container">{model_type_badge}{status_badge}{nsfw_badge}</div>'
-        )
-
-        # Show delete button for up-to-date installed models;
-        # For outdated: both delete (hidden below tile size 11) + checkbox stacked
-        # For non-installed: checkbox only
-        if installstatus == 'civmodelcardinstalled':
-            sha256_attr = f'data-sha256="{installed_file_sha256}"' if installed_file_sha256 else ''
-            card_html += (
-                f'<div class="delete-button-container">'
-                f'<button class="delete-model-btn" {sha256_attr} data-model-name="{model_name_js}" data-installed-count="{installed_versions_count}" '
-                f'onclick="deleteInstalledModel(event, \'{model_string}\', \'{installed_file_sha256 or ""}\', {installed_versions_count})" title="Delete model">'
-                f'<svg viewBox="0 0 24 24" xmlns="http://www.w3.org/2000/svg" fill="currentColor">'
-                f'<path d="M6 19c0 1.1.9 2 2 2h8c1.1 0 2-.9 2-2V7H6v12zM19 4h-3.5l-1-1h-5l-1 1H5v2h14V4z"/>'
-                f'</svg>'
-                f'</button>'
-                f'</div>'
-            )
-        elif installstatus == 'civmodelcardoutdated':
-            # Both delete (hides at tile < 11) + checkbox for batch update selection
-            sha256_attr = f'data-sha256="{installed_file_sha256}"' if installed_file_sha256 else ''
-            card_html += (
-                f'<div class="outdated-card-actions">'
-                f'<button class="delete-model-btn" {sha256_attr} data-model-name="{model_name_js}" data-installed-count="{installed_versions_count}" '
-                f'onclick="deleteInstalledModel(event, \'{model_string}\', \'{installed_file_sha256 or ""}\', {installed_versions_count})" title="Delete model">'
-                f'<svg viewBox="0 0 24 24" xmlns="http://www.w3.org/2000/svg" fill="currentColor">'
-                f'<path d="M6 19c0 1.1.9 2 2 2h8c1.1 0 2-.9 2-2V7H6v12zM19 4h-3.5l-1-1h-5l-1 1H5v2h14V4z"/>'
-                f'</svg>'
-                f'</button>'
-                f'<div class="checkbox-container">'
-                f'<input type="checkbox" class="model-checkbox" id="checkbox-{model_string}" '
-                f'onchange="multi_model_select(\'{model_string}\', \'{item["type"]}\', this.checked)">'
-                f'<label for="checkbox-{model_string}" class="custom-checkbox">'
-                f'<span class="checkbox-checkmark"></span>'
-                f'</label>'
-                f'</div>'
-                f'</div>'
-            )
-        else:
-            # Non-installed: checkbox for batch download
-            card_html += (
-                f'<div class="checkbox-container">'
-                f'<input type="checkbox" class="model-checkbox" id="checkbox-{model_string}" '
-                f'onchange="multi_model_select(\'{model_string}\', \'{item["type"]}\', this.checked)">'
-                f'<label for="checkbox-{model_string}" class="custom-checkbox">'
-                f'<span class="checkbox-checkmark"></span>'
-                f'</label>'
-                f'</div>'
-            )
-
-        # ModelCard HTML (Footer)
-        card_html += (
-            f'</div>'
-            f'{imgtag}'
-            f'<figcaption title="{full_name}">{display_name}</figcaption></figure>'
-        )
-        return card_html, date
+        # View-model of the card: rendered by _card_html() here, or by
+        # renderCivitaiCards() in the browser when client-side rendering is on
+        return {
+            'id': model_id,
+            'name': model_name,
+            'type': item['type'],
+            'typeLabel': get_display_type(item['type']),
+            'base': base_model,
+            'date': date,
+            'creator': model_uploader_card,
+            'nsfw': is_nsfw,
+            'nsfwBadge': is_nsfw and options.nsfw_badge,
+            'earlyAccess': early_access,
+            'favorite': model_uploader_card in favorite_creators,
+            'status': installstatus,
+            'badge': status_badge_type,
+            'baseShort': base_model_short,
+            'sha256': installed_file_sha256,
+            'installedCount': installed_versions_count,
+            'media': media_type,
+            'src': image_url,
+        }
 
     # Main function logic
     video_playback = getattr(opts, 'video_playback', True)
@@ -822,52 +1003,137 @@ def model_list_html(json_data):
         folder = contenttype_folder(item['type'], item['description'])
         if folder is not None:
             model_folders.add(str(folder))
-    existing_files, existing_files_sha256 = collect_existing_files(model_folders)
 
-    # Build HTML
-    HTML = '<div class="column civmodellist">'
-    sorted_models = {} if gl.sortNewest else None
     favorite_creators = set(_file.FavoriteCreators.get_as_list())
-
-    for item in json_data['items']:
-        model_card, date = get_model_card(item, existing_files, existing_files_sha256, playback, favorite_creators)
+    display_options = _card_display_options()
+    client_render = getattr(opts, 'civitai_neo_client_render', False)
+
+    def render_card(item, existing_files, existing_files_sha256):
+        """Cached [view, html] pair of a card, html built on first server-side use"""
+        card_key = _card_cache_key(item, existing_files, existing_files_sha256, favorite_creators, display_options)
+        cached_card = _card_cache_get(card_key)
+        if cached_card is None:
+            cached_card = [get_model_card(item, existing_files, existing_files_sha256, playback, favorite_creators, display_options), None]
+            _card_cache_put(card_key, cached_card)
+        if not client_render and cached_card[1] is None:
+            cached_card[1] = _card_html(cached_card[0])
+        return cached_card
+
+    def assemble(cards, placeholders=0):
+        """Grid HTML (or client-side payload) for rendered cards + trailing placeholders"""
+        # Date sections (newest first) when sorting by date
+        sections = None
         if gl.sortNewest:
-            if date not in sorted_models:
-                sorted_models[date] = []
-            sorted_models[date].append(model_card)
+            sorted_models = {}
+            for card in cards:
+                sorted_models.setdefault(card[0]['date'], []).append(card)
+            sections = []
+            for date, date_cards in sorted(sorted_models.items(), reverse=True):
+                if date == 'Not Found':
+                    formatted_date = 'Unknown Date'
+                else:
+                    try:
+                        date_obj = datetime.strptime(date, '%Y-%m-%d')
+                        formatted_date = date_obj.strftime('%B %d, %Y')
+                    except:
+                        formatted_date = date  # Fallback to original format
+                sections.append((formatted_date, date_cards))
+
+        # Client-side rendering: compact view-models, turned into cards by civitai-html.js
+        if client_render:
+            payload = {'placeholders': placeholders} if placeholders else {}
+            if sections is None:
+                payload['cards'] = [view for view, _ in cards]
+            else:
+                payload['sections'] = [{'title': title, 'cards': [view for view, _ in date_cards]} for title, date_cards in sections]
+            return f'<div class="column civmodellist" data-civcards="{escape(json.dumps(payload, separators=(",", ":")))}"></div>'
+
+        # Build HTML (parts joined once at the end)
+        parts = ['<div class="column civmodellist">']
+        if sections is None:
+            parts.extend(html for _, html in cards)
         else:
-            HTML += model_card
+            parts.append('<div class="date-sections-container">')
+            for formatted_date, date_cards in sections:
+                # Add card counter (only show if more than 1 card)
+                card_count = len(date_cards)
+                counter_html = f' <span class="card-counter">{card_count}</span>' if card_count > 1 else ''
+                parts.append(
+                    f'<div class="date-section">'
+                    f'<h4>{formatted_date}{counter_html}</h4>'
+                    '<div class="card-row">'
+                )
+                parts.extend(html for _, html in date_cards)
+                parts.append('</div></div>')
+            parts.append('</div>')
+        parts.append(_placeholder_cards(placeholders))
+        parts.append('</div>')
+        return ''.join(parts)
+
+    items = json_data['items']
+    if stream_batch:
+        # Cards render as not installed until the index lookup answers; each is
+        # rendered once (cards without local files are reused by the final grid)
+        lookup = _index_lookup_pool.submit(collect_existing_files, model_folders)
+        cards = []
+        for item in items:
+            if lookup.done():
+                break
+            cards.append(render_card(item, set(), set()))
+            if len(cards) % stream_batch == 0 and len(cards) < len(items):
+                yield assemble(cards, len(items) - len(cards)), False
+        existing_files, existing_files_sha256 = lookup.result()
+    else:
+        existing_files, existing_files_sha256 = collect_existing_files(model_folders)
 
-    if gl.sortNewest:
-        HTML += '<div class="date-sections-container">'
-        for date, cards in sorted(sorted_models.items(), reverse=True):
-            if not cards:
-                continue
+    yield assemble([render_card(item, existing_files, existing_files_sha256) for item in items]), True
 
-            if date == 'Not Found':
-                formatted_date = 'Unknown Date'
-            else:
-                try:
-                    date_obj = datetime.strptime(date, '%Y-%m-%d')
-                    formatted_date = date_obj.strftime('%B %d, %Y')
-                except:
-                    formatted_date = date  # Fallback to original format
-
-            # Add card counter (only show if more than 1 card)
-            card_count = len(cards)
-            counter_html = f' <span class="card-counter">{card_count}</span>' if card_count > 1 else ''
-            HTML += (
-                f'<div class="date-section">'
-                f'<h4>{formatted_date}{counter_html}</h4>'
-                '<div class="card-row">'
-            )
-            for card in cards:
-                HTML += card
-            HTML += '</div></div>'
-        HTML += '</div>'
-    HTML += '</div>'
+_CIVCARDS_RE = re.compile(r'data-civcards="([^"]*)"')
 
-    return HTML
+def client_card_count(html):
+    """Number of cards in a client-rendered grid payload (0 for server-rendered HTML)."""
+    match = _CIVCARDS_RE.search(html or '')
+    if not match:
+        return 0
+    try:
+        payload = json.loads(unescape(match.group(1)))
+    except ValueError:
+        return 0
+    if 'sections' in payload:
+        return sum(len(section['cards']) for section in payload['sections'])
+    return len(payload.get('cards', []))
+
+CIVITAI_DOMAINS = ('https://civitai.com', 'https://civitai.red')
+_SHA_SEARCH_DEADLINE = 60  # Seconds shared by the lookups on all domains
+_sha_search_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix='neo-sha-search')
+
+def lookup_sha256_all_domains(sha256_hash, headers=None):
+    """
+    Ask every CivitAI domain for a SHA256 at the same time, so a search costs one
+    round-trip instead of one per domain.
+    Returns [(domain, status_code, data)] in CIVITAI_DOMAINS order; status_code is
+    None for a domain that failed or missed the shared deadline.
+    """
+    futures = [
+        (domain, _sha_search_pool.submit(_http.bind_lane(_file.fetch_version_by_hash), sha256_hash, domain, headers))
+        for domain in CIVITAI_DOMAINS
+    ]
+    wait([future for _, future in futures], timeout=_SHA_SEARCH_DEADLINE)
+
+    results = []
+    for domain, future in futures:
+        if not future.done():
+            future.cancel()
+            debug_print(f"SHA256 lookup on {domain} missed the {_SHA_SEARCH_DEADLINE}s deadline")
+            results.append((domain, None, None))
+            continue
+        try:
+            status, data = future.result()
+        except Exception as e:
+            debug_print(f"SHA256 lookup on {domain} failed: {e}")
+            status, data = None, None
+        results.append((domain, status, data))
+    return results
 
 def _search_by_sha256(sha256_hash):
     """Search for a model by SHA256 hash"""
@@ -881,17 +1147,9 @@ def _search_by_sha256(sha256_hash):
     proxies, ssl = get_proxies()
 
     candidates = []
-    domains = ['https://civitai.com', 'https://civitai.red']
     try:
-        for domain in domains:
-            api_url = f"{domain}/api/v1/model-versions/by-hash/{normalized_hash}"
-            try:
-                response = requests.get(api_url, headers=headers, timeout=(60, 30), proxies=proxies, verify=ssl)
-            except requests.exceptions.RequestException:
-                continue
-
-            if response.status_code == 200:
-                data = response.json()
+        for domain, status, data in lookup_sha256_all_domains(normalized_hash, headers):
+            if status == 200:
                 if not data or 'error' in data:
                     continue
 
@@ -909,9 +1167,7 @@ def _search_by_sha256(sha256_hash):
                             'downloadUrl': f.get('downloadUrl') or data.get('downloadUrl')
                         })
                         break
-            elif response.status_code == 404:
-                continue
-            elif response.status_code == 503:
+            elif status == 503:
                 return 'offline'
 
     except Exception:
@@ -927,9 +1183,9 @@ def _search_by_sha256(sha256_hash):
             return 'not_found'
         model_url = f"https://{get_civitai_domain()}/api/v1/models/{model_id}"
         try:
-            model_response = requests.get(model_url, headers=headers, timeout=(60, 30), proxies=proxies, verify=ssl)
+            model_response = _http.get(model_url, headers=headers, timeout=(60, 30), proxies=proxies, verify=ssl)
             if model_response.status_code == 200:
-                model_data = model_response.json()
+                model_data = _http.loads(model_response.content)
                 return {
                     'items': [model_data],
                     'metadata': {
@@ -1024,9 +1280,44 @@ def create_api_url(content_type=None, sort_type=None, period_type=None, use_sear
 
 ## === ANXETY EDITs ===
 def initial_model_page(content_type=None, sort_type=None, period_type=None, use_search_term=None, search_term=None, current_page=None, base_filter=None, only_liked=None, nsfw=None, exact_search=None, tile_count=None, from_update_tab=False):
+    for outputs in _model_page_steps(content_type, sort_type, period_type, use_search_term, search_term, current_page, base_filter, only_liked, nsfw, exact_search, tile_count, from_update_tab, progressive=False):
+        pass
+    return outputs[:-1]
+
+def initial_model_page_stream(content_type=None, sort_type=None, period_type=None, use_search_term=None, search_term=None, current_page=None, base_filter=None, only_liked=None, nsfw=None, exact_search=None, tile_count=None, from_update_tab=False):
+    """
+    Generator variant of initial_model_page() for queued Gradio events, with the
+    visible card grid as an extra (18th) output. With civitai_neo_progressive_render
+    on, intermediate grids go to that output only: placeholders before the API
+    call, then cards in batches of _STREAM_BATCH while the local index is queried.
+    The final grid, with install badges, goes through list_html_input alone, so
+    its change chain (filters, hide installed, select all) runs once.
+    """
+    progressive = getattr(opts, 'civitai_neo_progressive_render', True)
+    yield from _model_page_steps(content_type, sort_type, period_type, use_search_term, search_term, current_page, base_filter, only_liked, nsfw, exact_search, tile_count, from_update_tab, progressive=progressive)
+
+_STREAM_BATCH = 9  # Cards added per progressive step
+_stream_serial = itertools.count(1)
+
+def _grid_outputs(html):
+    """Stream step that only updates the visible grid."""
+    return tuple(gr.update() for _ in range(17)) + (gr.update(value=html),)
+
+def _placeholder_cards(count):
+    return ''.join(
+        '<figure class="civcard-placeholder">'
+        '<img src="data:image/gif;base64,R0lGODlhAQABAIAAAAAAAP///yH5BAEAAAAALAAAAAABAAEAAAIBRAA7" alt="">'
+        '</figure>'
+        for _ in range(max(0, count))
+    )
+
+def _model_page_steps(content_type, sort_type, period_type, use_search_term, search_term, current_page, base_filter, only_liked, nsfw, exact_search, tile_count, from_update_tab, progressive):
+    """Yields page outputs (17 items) + the visible grid; only the last one is final."""
     current_inputs = (content_type, sort_type, period_type, use_search_term, search_term, tile_count, base_filter, nsfw, exact_search)
     if current_inputs != gl.previous_inputs and gl.previous_inputs != None or not current_page:
         current_page = 1
+    if current_inputs != gl.previous_inputs:
+        _cancel_prefetch()
     gl.previous_inputs = current_inputs
 
     # ── Update Mode: render from gl.update_items, no API call ──
@@ -1037,7 +1328,7 @@ def initial_model_page(content_type=None, sort_type=None, period_type=None, use_
         _bf = base_filter if from_update_tab else None
         html, max_page, current_page, hasPrev, hasNext = update_mode_page_html(
             _ct, _bf, tile_count, current_page)
-        return (
+        yield (
             gr.update(choices=[], value='', interactive=True),
             gr.update(choices=[], value=''),
             gr.update(value=html),
@@ -1054,8 +1345,13 @@ def initial_model_page(content_type=None, sort_type=None, period_type=None, use_
             gr.update(value='<div style="min-height: 0px;"></div>'),
             gr.update(value=None),
             gr.update(value=None),
-            gr.update(value=None)
+            gr.update(value=None),
+            gr.update()
         )
+        return
+
+    if progressive:
+        yield _grid_outputs(f'<div class="column civmodellist">{_placeholder_cards(int(tile_count or 27))}</div>')
 
     if not from_update_tab:
         gl.from_update_tab = False
@@ -1116,9 +1412,21 @@ def initial_model_page(content_type=None, sort_type=None, period_type=None, use_
                     model_list.append(f"{item['name']} ({item['id']})")
 
             max_page = max(gl.url_list.keys())
-            HTML = model_list_html(gl.json_data)
+            if progressive:
+                for HTML, final in model_list_html_steps(gl.json_data, _STREAM_BATCH):
+                    if not final:
+                        yield _grid_outputs(HTML)
+            else:
+                HTML = model_list_html(gl.json_data)
+            if not gl.from_update_tab and use_search_term != 'SHA256':
+                _prefetch_next_page(current_inputs)
 
-    return (
+    if progressive:
+        # list_html_input only runs its change chain (which replaces the preview
+        # grid) when the value differs from the previous page's
+        HTML = f'{HTML}<!-- {next(_stream_serial)} -->'
+
+    yield (
         gr.update(choices=model_list, value='', interactive=True),     # Model List
         gr.update(choices=[], value=''),                               # Version List
         gr.update(value=HTML),                                             # HTML Tiles
@@ -1135,7 +1443,8 @@ def initial_model_page(content_type=None, sort_type=None, period_type=None, use_
         gr.update(value='<div style="min-height: 0px;"></div>'),           # Preview HTML
         gr.update(value=None),                                          # Trained Tags
         gr.update(value=None),                                          # Base Model
-        gr.update(value=None)                                           # Model Filename
+        gr.update(value=None),                                          # Model Filename
+        gr.update()                                                     # Visible grid (stream only)
     )
 
 def prev_model_page(content_type, sort_type, period_type, use_search_term, search_term, current_page, base_filter, only_liked, nsfw, exact_search, tile_count):
@@ -1148,7 +1457,8 @@ def next_model_page(content_type, sort_type, period_type, use_search_term, searc
         return initial_model_page(content_type, sort_type, period_type, use_search_term, search_term, current_page, base_filter, only_liked, nsfw, exact_search, tile_count)
 
     api_url = create_api_url(isNext=isNext)
-    gl.json_data = request_civit_api(api_url)
+    prefetched, prerendered = _take_prefetched(api_url, current_inputs) if isNext else (None, None)
+    gl.json_data = prefetched if prefetched is not None else request_civit_api(api_url)
 
     next_page = current_page
     model_list = []
@@ -1171,7 +1481,14 @@ def next_model_page(content_type, sort_type, period_type, use_search_term, searc
                 model_list.append(f"{item['name']} ({item['id']})")
 
         max_page = max(gl.url_list.keys())
-        HTML = model_list_html(gl.json_data)
+        if prerendered is not None:
+            # Cards were built from a filtered copy; keep gl.json_data in the same shape
+            gl.json_data['items'] = prerendered['items']
+            HTML = prerendered['html']
+        else:
+            HTML = model_list_html(gl.json_data)
+        if not gl.from_update_tab:
+            _prefetch_next_page(current_inputs)
 
     return (
         gr.update(choices=model_list, value='', interactive=True),  # Model List
@@ -1208,6 +1525,131 @@ def insert_metadata(page_nr, api_url=None):
 
     return gl.json_data
 
+# ─────────────────────────────────────────────────────────────────────────────
+# Next-page prefetch
+# ─────────────────────────────────────────────────────────────────────────────
+# One slot: once a browser page is shown, metadata.nextPage is fetched (and, with
+# civitai_neo_prerender_next_page, rendered) on a background thread. Next takes the
+# slot if its URL and filters still match; a filter change cancels it.
+
+_prefetch_lock = threading.Lock()
+_prefetch_slot = None  # dict: url, inputs, cancel, done, data, rendered
+
+
+def _cancel_prefetch():
+    global _prefetch_slot
+    with _prefetch_lock:
+        if _prefetch_slot is not None:
+            _prefetch_slot['cancel'].set()
+            _prefetch_slot = None
+
+
+def _prefetch_next_page(current_inputs):
+    """Start fetching the page after the one just shown, replacing any older slot."""
+    global _prefetch_slot
+    if not getattr(opts, 'civitai_neo_prefetch_next_page', True):
+        return
+    metadata = gl.json_data.get('metadata') if isinstance(gl.json_data, dict) else None
+    next_url = metadata.get('nextPage') if isinstance(metadata, dict) else None
+    if not next_url or next_url.startswith(('local_only://', 'sha256_search_')):
+        _cancel_prefetch()
+        return
+
+    with _prefetch_lock:
+        slot = _prefetch_slot
+        if slot is not None and slot['url'] == next_url and slot['inputs'] == current_inputs:
+            return
+        if slot is not None:
+            slot['cancel'].set()
+        slot = {
+            'url': next_url,
+            'inputs': current_inputs,
+            'cancel': threading.Event(),
+            'done': threading.Event(),
+            'data': None,
+            'rendered': None,
+        }
+        _prefetch_slot = slot
+
+    threading.Thread(target=_prefetch_worker, args=(slot,), name='civitai-prefetch', daemon=True).start()
+
+
+@_http.background_lane
+def _prefetch_worker(slot):
+    try:
+        data = request_civit_api(slot['url'])
+        if slot['cancel'].is_set():
+            return
+        if not isinstance(data, dict) or 'items' not in data or 'metadata' not in data:
+            debug_print(f"Prefetch of next page failed: {data}")
+            return
+        slot['data'] = data
+        debug_print(f"Prefetched next page: {slot['url']}")
+
+        if getattr(opts, 'civitai_neo_prerender_next_page', False):
+            rendered = copy.deepcopy(data)
+            html = model_list_html(rendered)
+            if not slot['cancel'].is_set():
+                slot['rendered'] = {'items': rendered['items'], 'html': html, 'state': _render_state(rendered)}
+    except Exception as e:
+        debug_print(f"Prefetch of next page failed: {e}")
+    finally:
+        slot['done'].set()
+
+
+def _render_state(json_data):
+    """Everything besides the API data that changes a page's card HTML."""
+    model_folders = set()
+    for item in json_data.get('items', []):
+        folder = contenttype_folder(item['type'], item['description'])
+        if folder is not None:
+            model_folders.add(str(folder))
+    existing_files, existing_files_sha256 = _index.existing_files(model_folders)
+
+    installed = set()
+    for item in json_data.get('items', []):
+        for version in item.get('modelVersions', []):
+            for file in version.get('files', []):
+                file_name = file.get('name', '').lower()
+                file_sha256 = normalize_sha256(file.get('hashes', {}).get('SHA256', ''))
+                if file_name in existing_files or (file_sha256 and file_sha256 in existing_files_sha256):
+                    installed.add(file_name)
+
+    return (
+        frozenset(installed),
+        frozenset(_file.FavoriteCreators.get_as_list()),
+        gl.sortNewest,
+        tuple(getattr(opts, name, None) for name in (
+            'video_playback', 'hide_early_access', 'show_nsfw_badge', 'show_civitai_status_badges',
+            'resize_preview_cards', 'resize_preview_size', 'precise_version_check',
+            'civitai_neo_client_render',
+        )),
+    )
+
+
+def _take_prefetched(api_url, current_inputs):
+    """
+    Claim the prefetch slot for api_url, waiting for it if still in flight.
+    Returns (data, prerendered) — prerendered is None unless the cards built in the
+    background still match the current install state and display options.
+    """
+    global _prefetch_slot
+    with _prefetch_lock:
+        slot = _prefetch_slot
+        if slot is None or slot['url'] != api_url or slot['inputs'] != current_inputs:
+            return None, None
+        _prefetch_slot = None
+
+    slot['done'].wait()
+    if slot['cancel'].is_set() or slot['data'] is None:
+        return None, None
+
+    rendered = slot['rendered']
+    if rendered is not None and rendered['state'] != _render_state(rendered):
+        debug_print('Prefetched cards are outdated, rendering again.')
+        rendered = None
+    return slot['data'], rendered
+
 ## === ANXETY EDITs ===
 def update_model_versions(model_id, json_input=None, base_filter=None):
     if json_input:
@@ -1238,28 +1680,10 @@ def update_model_versions(model_id, json_input=None, base_filter=None):
                     version_filename = version_file['name']
                     version_files.add((version['name'], version_filename, file_sha256))
 
-            for root, _, files in os.walk(model_folder, followlinks=True):
-                for file in files:
-                    if file.endswith('.json'):
-                        try:
-                            json_path = os.path.join(root, file)
-                            with open(json_path, 'r', encoding='utf-8') as f:
-                                json_data = json.load(f)
-                                if isinstance(json_data, dict):
-                                    sha256 = normalize_sha256(json_data.get('sha256'))
-                                    if sha256:
-                                        for version_name, _, file_sha256 in version_files:
-                                            if sha256 == file_sha256:
-                                                installed_versions.add(version_name)
-                                                break
-                        except Exception as e:
-                            print(f"failed to read: '{file}': {e}")
-
-                    # filename_check
-                    for version_name, version_filename, _ in version_files:
-                        if file.lower() == version_filename.lower():
-                            installed_versions.add(version_name)
-                            break
+            existing_names, existing_sha256 = _index.existing_files([model_folder])
+            for version_name, version_filename, file_sha256 in version_files:
+                if (file_sha256 and file_sha256 in existing_sha256) or version_filename.lower() in existing_names:
+                    installed_versions.add(version_name)
 
             version_names = list(versions_dict.keys())
             # Build display names with [Installed] and (Early Access) if applicable
@@ -1322,7 +1746,7 @@ def fetch_and_process_image(image_url):
     try:
         parsed_url = urllib.parse.urlparse(image_url)
         if parsed_url.scheme and parsed_url.netloc:
-            response = requests.get(image_url, proxies=proxies, verify=ssl)
+            response = _http.get(image_url, proxies=proxies, verify=ssl)
             if response.status_code == 200:
                 image = Image.open(BytesIO(response.content))
                 geninfo, _ = read_info_from_image(image)
@@ -1541,7 +1965,7 @@ def update_model_info(model_string=None, model_version=None, only_html=False, in
                     for idx, pic in enumerate(api_version['images']):
                         index = f"preview_{idx}" if from_preview else idx
                         prompt_dict = pic.get('meta', {}) or {}
-                        image_url = re.sub(r'/width=\d+', f"/width={pic.get('width', '')}", pic['url'])
+                        image_url = _WIDTH_RE.sub(f"/width={pic.get('width', '')}", pic['url'])
                         is_video = pic.get('type') == 'video'
 
                         img_html += (
@@ -1902,42 +2326,20 @@ def update_model_info(model_string=None, model_version=None, only_html=False, in
         installed_model_filename = None
         extensions = ['.pt', '.ckpt', '.pth', '.safetensors', '.th', '.zip', '.vae']
 
-        for root, dirs, files in os.walk(model_folder, followlinks=True):
-            for filename in files:
-                if filename.endswith('.json'):
-                    json_file_path = os.path.join(root, filename)
-                    with open(json_file_path, 'r', encoding='utf-8') as f:
-                        try:
-                            data = json.load(f)
-                            sha256 = normalize_sha256(data.get('sha256'))
-                            if sha256 and sha256 == sha256_value:
-                                folder_location = root
-                                BtnDownInt = False
-                                BtnDel = True
-
-                                # Find the actual model file with same base name
-                                base_name = os.path.splitext(filename)[0]
-                                for model_file in files:
-                                    if os.path.splitext(model_file)[0] == base_name:
-                                        file_ext = os.path.splitext(model_file)[1].lower()
-                                        if file_ext in extensions:
-                                            installed_model_filename = model_file
-                                            break
-                                break
-                        except Exception as e:
-                            print(f"Error decoding JSON: {str(e)}")
-            else:
-                # filename_check
-                for filename in files:
-                    if filename.lower() == model_filename.lower() or filename.lower() == cleaned_name(model_filename).lower():
-                        folder_location = root
-                        BtnDownInt = False
-                        BtnDel = True
-                        installed_model_filename = filename
-                        break
-
-            if folder_location != 'None':
-                break
+        sha_matches = _index.find_by_sha256([model_folder], sha256_value)
+        if sha_matches:
+            folder_location, sidecar_name = sha_matches[0]
+            BtnDownInt = False
+            BtnDel = True
+            # Find the actual model file with same base name
+            installed_model_filename = _index.find_model_file(folder_location, sidecar_name, extensions)
+        else:
+            # filename_check
+            name_matches = _index.find_by_name([model_folder], [model_filename, cleaned_name(model_filename)])
+            if name_matches:
+                folder_location, installed_model_filename = name_matches[0]
+                BtnDownInt = False
+                BtnDel = True
 
         # Check if auto-organization is enabled
         auto_organize = getattr(opts, 'civitai_neo_auto_organize', False)
@@ -2192,36 +2594,77 @@ def get_headers(referer=None, no_api=None):
 
     return headers
 
+_api_inflight = _http.SingleFlight()
+
 def request_civit_api(api_url=None, skip_error_check=False):
+    """
+    Fetch and parse a CivitAI API URL (see _request_civit_api). Identical requests
+    already in flight are joined instead of sent again; every caller of a shared
+    call gets its own deep copy, since callers mutate the parsed result.
+    """
+    key = (api_url, skip_error_check, get_headers().get('Authorization'))
+    data, shared = _api_inflight.do(key, lambda: _request_civit_api(api_url, skip_error_check))
+    if shared:
+        debug_print(f"Shared in-flight API request: {api_url}")
+        return copy.deepcopy(data)
+    return data
+
+def _request_civit_api(api_url=None, skip_error_check=False):
     headers = get_headers()
     proxies, ssl = get_proxies()
     max_attempts = 3
-    base_backoff_seconds = 2
+
+    cached = _api_cache.lookup(api_url, headers)
+    if cached:
+        try:
+            if cached['fresh']:
+                debug_print(f"API cache hit: {api_url}")
+                return _http.loads(cached['body'])
+        except ValueError:
+            cached = None
+
+    def _offline(code):
+        # CivitAI unreachable: a stale cached copy beats an error page
+        if cached:
+            print(f"CivitAI is unreachable, using cached data for: {api_url}")
+            return _http.loads(cached['body'])
+        return code
+
+    if cached and _http.breaker.is_open():
+        return _offline('offline')
 
     for attempt in range(1, max_attempts + 1):
         try:
-            response = requests.get(api_url, headers=headers, timeout=(60, 30), proxies=proxies, verify=ssl)
-            if not response.text or response.text.strip() == '':
+            request_headers = dict(headers, **_api_cache.conditional_headers(cached)) if cached else headers
+            response = _http.get(api_url, headers=request_headers, timeout=(60, 30), proxies=proxies, verify=ssl)
+            if response.status_code == 304 and cached:
+                debug_print(f"API cache revalidated: {api_url}")
+                _api_cache.revalidated(api_url, headers)
+                return _http.loads(cached['body'])
+
+            if not response.content or not response.content.strip():
                 print(f"CivitAI API returned empty response for: {api_url}")
                 return 'error'
 
             if skip_error_check:
-                response.encoding = 'utf-8'
                 try:
-                    data = json.loads(response.text)
+                    data = _http.loads(response.content)
+                    if response.status_code == 200:
+                        _cache_response(api_url, headers, response)
                     return data
-                except json.JSONDecodeError as e:
+                except ValueError as e:
                     print(f"CivitAI API: JSON decode error - {e}")
                     return 'error'
 
             response.raise_for_status()
-            response.encoding = 'utf-8'
             try:
-                data = json.loads(response.text)
-            except json.JSONDecodeError:
+                data = _http.loads(response.content)
+            except ValueError:
+                response.encoding = 'utf-8'
                 print(response.text)
                 print('The CivitAI servers are currently offline. Please try again later.')
                 return 'offline'
+            _cache_response(api_url, headers, response)
             return data
 
         except requests.exceptions.HTTPError as e:
@@ -2229,24 +2672,30 @@ def request_civit_api(api_url=None, skip_error_check=False):
                 print(f"Model version not found (404): {api_url}")
                 return 'not_found'
             
-            if e.response.status_code in [500, 502, 503, 504]:
+            # The shared rate limiter is already paused (Retry-After or backoff),
+            # so the next attempt waits exactly as long as the server asked
+            if e.response.status_code in _http.THROTTLE_STATUS:
                 if attempt < max_attempts:
-                    wait_time = base_backoff_seconds * (2 ** (attempt - 1))
-                    print(f"[CivitAI Browser Neo] - HTTP {e.response.status_code} Error (attempt {attempt}/{max_attempts}). Retrying in {wait_time}s...")
-                    time.sleep(wait_time)
+                    wait_time = _http.limiter.pause_remaining()
+                    print(f"[CivitAI Browser Neo] - HTTP {e.response.status_code} Error (attempt {attempt}/{max_attempts}). Retrying in {wait_time:.0f}s...")
                     continue
             
             print(f"HTTP Error {e.response.status_code}: {e}")
+            if e.response.status_code in _http.OUTAGE_STATUS:
+                return _offline('error')
             return 'error'
 
+        except _http.CircuitOpen:
+            debug_print(f"Circuit breaker open, skipped: {api_url}")
+            return _offline('offline')
+
         except requests.exceptions.Timeout:
             if attempt < max_attempts:
-                wait_time = base_backoff_seconds * attempt
-                print(f"Request timed out (attempt {attempt}/{max_attempts}). Retrying in {wait_time}s...")
-                time.sleep(wait_time)
+                wait_time = _http.limiter.pause_remaining()
+                print(f"Request timed out (attempt {attempt}/{max_attempts}). Retrying in {wait_time:.0f}s...")
                 continue
             print('The request timed out. Please try again later.')
-            return 'timeout'
+            return _offline('timeout')
 
         except requests.exceptions.RequestException as e:
             error_text = str(e)
@@ -2259,19 +2708,25 @@ def request_civit_api(api_url=None, skip_error_check=False):
             )
 
             if dns_resolution_error and attempt < max_attempts:
-                wait_time = base_backoff_seconds * attempt
-                print(f"[CivitAI Browser Neo] - DNS resolution failed (attempt {attempt}/{max_attempts}). Retrying in {wait_time}s...")
-                time.sleep(wait_time)
+                wait_time = _http.limiter.pause_remaining()
+                print(f"[CivitAI Browser Neo] - DNS resolution failed (attempt {attempt}/{max_attempts}). Retrying in {wait_time:.0f}s...")
                 continue
 
             print(f"[CivitAI Browser Neo] - Error: {e}")
             if dns_resolution_error:
                 print(f"[CivitAI Browser Neo] - DNS resolution failed (attempt {max_attempts}/{max_attempts}). No more retries.")
-                return 'dns_error'
-            return 'error'
+                return _offline('dns_error')
+            return _offline('error')
 
     return 'error'
 
+def _cache_response(api_url, headers, response):
+    _api_cache.store(
+        api_url, headers, response.content,
+        etag=response.headers.get('ETag'),
+        last_modified=response.headers.get('Last-Modified'),
+    )
+
 ## === ANXETY EDITs ===
 def inject_removed_banner(html: str) -> str:
     """Prepend a 'removed by owner' warning banner to existing model HTML."""
@@ -1,6 +1,5 @@
 import subprocess
 import threading
-import hashlib
 import requests
 import urllib.parse
 import platform
@@ -21,6 +20,8 @@ import scripts.civitai_file_manage as _file
 import scripts.civitai_global as gl
 import scripts.civitai_api as _api
 import scripts.download_log as _dl_log
+import scripts.model_index as _index
+import scripts.civitai_http as _http
 from scripts.civitai_api import is_early_access, is_model_nsfw
 from scripts.civitai_global import print, debug_print
 
@@ -228,19 +229,7 @@ def _resolve_versions_to_download(versions_list, model_folder):
         return []
 
     # Collect SHA256 hashes from local JSON files in the model folder
-    installed_hashes = set()
-    if model_folder and os.path.isdir(str(model_folder)):
-        for root, _, files in os.walk(str(model_folder), followlinks=True):
-            for fname in files:
-                if fname.endswith('.json'):
-                    try:
-                        data = _api.safe_json_load(os.path.join(root, fname))
-                        if data:
-                            sha = data.get('sha256', '')
-                            if sha:
-                                installed_hashes.add(sha.upper())
-                    except Exception:
-                        pass
+    installed_hashes = _index.sidecar_hashes([model_folder]) if model_folder else set()
 
     if not installed_hashes:
         return [versions_list[0]]
@@ -684,8 +673,10 @@ def get_download_link(url, model_id):
     headers = _api.get_headers(model_id)
     proxies, ssl = _api.get_proxies()
 
-    response = requests.get(url, headers=headers, allow_redirects=False, proxies=proxies, verify=ssl, timeout=30)
+    response = _http.get(url, headers=headers, allow_redirects=False, proxies=proxies, verify=ssl, timeout=30)
 
+    if response.status_code in (429, 503):
+        raise _http.Throttled(f"HTTP {response.status_code}", response=response)
     if 300 <= response.status_code <= 308:
         if 'login?returnUrl' in response.text and 'reason=download-auth' in response.text:
             return 'NO_API'
@@ -696,7 +687,7 @@ def get_download_link(url, model_id):
         return None
 
 def _get_download_link_with_retry(url, model_id, file_name, progress=None):
-    """Fetch download link with 1 retry on timeout.
+    """Fetch download link with 1 retry on timeout or 429 / 503 (paced by the shared rate limiter).
     Returns the link, 'NO_API', or None on failure.
     Sets gl.download_fail and updates progress on failure so the caller
     can simply return and let the queue advance to the next item."""
@@ -704,14 +695,13 @@ def _get_download_link_with_retry(url, model_id, file_name, progress=None):
         try:
             link = get_download_link(url, model_id)
             return link
-        except (requests.exceptions.Timeout, requests.exceptions.ReadTimeout) as e:
+        except (requests.exceptions.Timeout, requests.exceptions.ReadTimeout, _http.Throttled) as e:
             if attempt == 0:
-                msg = f"Timeout getting download link for '{file_name}', retrying in 3s..."
+                msg = f"Timeout getting download link for '{file_name}', retrying in {_http.limiter.pause_remaining():.0f}s..."
                 print(msg)
                 debug_print(f"[Download] {msg}")
                 if progress is not None:
                     progress(0, desc=msg)
-                time.sleep(3)
             else:
                 msg = f"Timeout getting download link for '{file_name}' after retry — skipping item."
                 print(msg)
@@ -923,6 +913,10 @@ def info_to_json(install_path, model_id, model_sha256, unpackList=None):
     })
     if unpackList:
         data['unpackList'] = unpackList
+    # Digests from the post-download integrity pass (SHA256 / AutoV2 / CRC32 / BLAKE3)
+    digests = _index.lookup_hashes(install_path)
+    if digests:
+        data['hashes'] = {**(data.get('hashes') or {}), **digests}
 
     _api.safe_json_save(json_file, data)
 
@@ -981,18 +975,25 @@ def download_file_old(url, file_path, model_id, progress=gr.Progress() if queue
                             if progress != None:
                                 progress(0, desc='Download cancelled.')
                             return
+                        retry_wait = None
                         try:
                             if gl.cancel_status:
                                 if progress != None:
                                     progress(0, desc='Download cancelled.')
                                 return
-                            response = requests.get(download_link, headers=headers, stream=True, timeout=10, proxies=proxies, verify=ssl)
+                            response = _http.get(download_link, headers=headers, stream=True, timeout=10, proxies=proxies, verify=ssl)
                             if response.status_code == 404:
                                 if progress != None:
                                     progress(0, desc=f"Encountered an error during download of: {file_name_display}, file is not found on CivitAI servers.")
                                 gl.download_fail = True
                                 return
+                            if response.status_code in _http.THROTTLE_STATUS:
+                                retry_wait = _http.retry_after(response)
+                                response.close()
+                                raise TimeOutFunction(f"HTTP {response.status_code}")
                             total_size = int(response.headers.get('Content-Length', 0))
+                        except (TimeOutFunction, _http.CircuitOpen):
+                            raise
                         except:
                             raise TimeOutFunction('Timed Out')
 
@@ -1021,11 +1022,18 @@ def download_file_old(url, file_path, model_id, progress=gr.Progress() if queue
                                         progress(downloaded_size / total_size, desc=f"Downloading: {file_name_display} {convert_size(downloaded_size)} / {convert_size(total_size)} - Speed: {convert_size(int(download_speed))}/s - ETA: {eta_formatted} - Queue: {current_count}/{total_count}")
                                     last_update_time = current_time
                                 if gl.isDownloading == False:
-                                    response.close
+                                    response.close()
                                     break
                         downloaded_size = os.path.getsize(file_path)
                         break
 
+                    except _http.CircuitOpen:
+                        # CivitAI is considered down: retrying now would fail the same way
+                        if progress != None:
+                            progress(0, desc=f"CivitAI appears to be offline, skipped download of: {file_name_display}")
+                        gl.download_fail = True
+                        return
+
                     except TimeOutFunction:
                         if progress != None:
                             progress(0, desc='CivitAI API did not respond, retrying...')
@@ -1035,7 +1043,8 @@ def download_file_old(url, file_path, model_id, progress=gr.Progress() if queue
                                 progress(0, desc=f"Encountered an error during download of: {file_name_display}, please try again.")
                             gl.download_fail = True
                             return
-                        time.sleep(5)
+                        # Retry-After when the server sent one, otherwise 5s doubling per failure
+                        time.sleep(retry_wait if retry_wait is not None else min(30, 5 * 2 ** (4 - max_retries)))
 
             if (gl.isDownloading == False):
                 break
@@ -1067,6 +1076,7 @@ def download_file_old(url, file_path, model_id, progress=gr.Progress() if queue
             os.remove(file_path)
         time.sleep(5)
 
+@_http.background_lane
 def download_create_thread(download_finish, queue_trigger, progress=gr_progress_threadable() if queue else None):
     global current_count
 
@@ -1135,10 +1145,8 @@ def download_create_thread(download_finish, queue_trigger, progress=gr_progress_
                     def _find_sha_candidates(sha_val):
                         res = []
                         seen = set()
-                        for domain in ('https://civitai.com', 'https://civitai.red'):
+                        for domain, _status, data in _api.lookup_sha256_all_domains(sha_val, _api.get_headers()):
                             try:
-                                url = f"{domain}/api/v1/model-versions/by-hash/{sha_val}"
-                                data = _api.request_civit_api(url)
                                 if isinstance(data, dict) and data.get('id'):
                                     vid = data.get('id')
                                     mid = data.get('modelId')
@@ -1255,11 +1263,10 @@ def download_create_thread(download_finish, queue_trigger, progress=gr_progress_
         if not gl.cancel_status and not gl.download_fail and item.get('model_sha256') and os.path.exists(path_to_new_file):
             if progress is not None:
                 progress(0.99, desc=f"Verifying integrity: {item['model_filename']}...")
-            sha256_hash = hashlib.sha256()
-            with open(path_to_new_file, 'rb') as _f:
-                for _chunk in iter(lambda: _f.read(8 * 1024 * 1024), b''):
-                    sha256_hash.update(_chunk)
-            actual_sha256 = sha256_hash.hexdigest().upper()
+            # One pass computes every digest; cached so later scans / Forge syncs never re-read the file
+            digests = _file.compute_file_digests(path_to_new_file)
+            actual_sha256 = digests['SHA256']
+            _index.store_hash(path_to_new_file, actual_sha256, digests, _file.quick_fingerprint(path_to_new_file))
             if actual_sha256 != item['model_sha256'].upper():
                 sha_mismatch_resolved = False
                 version_id = item.get('version_id')
@@ -1268,7 +1275,7 @@ def download_create_thread(download_finish, queue_trigger, progress=gr_progress_
                         domain = _api.get_civitai_domain()
                         api_url = f"https://{domain}/api/v1/model-versions/{version_id}"
                         proxies, ssl = _api.get_proxies()
-                        response = requests.get(api_url, headers=_api.get_headers(), timeout=(60, 30), proxies=proxies, verify=ssl)
+                        response = _http.get(api_url, headers=_api.get_headers(), timeout=(60, 30), proxies=proxies, verify=ssl)
                         if response.status_code == 200:
                             data = response.json()
                             files = data.get('files', [])
@@ -1462,15 +1469,17 @@ def arrange_queue(input):
 def get_style(size, left_border):
     return f"flex-grow: {size};" + ("border-left: 1px solid var(--border-color-primary);" if left_border else '') + "padding: 5px 10px 5px 10px;width: 0;align-self: center;"
 
+_DL_ID_RE = re.compile(r'dl_id="(\d+)"')
+
 def download_manager_html(current_html):
     html = current_html.rsplit('</div>', 1)[0]
-    pattern = r'dl_id="(\d+)"'
-    matches = re.findall(pattern, html)
-    existing_item_ids = [int(match) for match in matches]
+    # Rows already in the incoming list (set: one lookup per queued item)
+    existing_item_ids = {int(match) for match in _DL_ID_RE.findall(html)}
+    parts = [html]
 
     for item in gl.download_queue:
-        if item['dl_id'] not in existing_item_ids:
-            download_item = (
+        if int(item['dl_id']) not in existing_item_ids:
+            parts.append(
                 f'<div class="civitai_dl_item" dl_id="{item["dl_id"]}" style="display: flex; font-size: var(--section-header-text-size);">'
                 f'<div class="dl_name" style="{get_style(1, False)}"><span title="{item["model_name"]}">{item["model_name"]}</span></div>'
                 f'<div class="dl_ver" style="{get_style(0.75, True)}"><span title="{item["version_name"]}">{item["version_name"]}</span></div>'
@@ -1479,10 +1488,9 @@ def download_manager_html(current_html):
                 f'<div class="dl_action_btn" style="{get_style(0.3, True)}text-align: center;"><span onclick="removeDlItem({item["dl_id"]}, this)" class="civitai-btn-text" style="font-size: larger;">Remove</span></div>'
                 '</div>'
             )
-            html += download_item
-    html += '</div>'
+    parts.append('</div>')
 
-    return html
+    return ''.join(parts)
 
 
 # ─── Queue Restore  (called from civitai_gui.py) ─────────────────────────────
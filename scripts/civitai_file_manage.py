@@ -1,5 +1,4 @@
-import urllib.request
-import urllib.error
+import urllib.parse
 import requests
 import hashlib
 import base64
@@ -10,7 +9,11 @@ import re
 import os
 import io
 import shutil
+import queue as _queue
+import threading
+import zlib
 import gradio as gr
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from urllib.parse import urlparse
 from pathlib import Path
 from PIL import Image
@@ -23,6 +26,10 @@ import scripts.civitai_download as _download
 import scripts.civitai_file_manage as _file
 import scripts.civitai_global as gl
 import scripts.civitai_api as _api
+import scripts.model_index as _index
+import scripts.civitai_http as _http
+import scripts.api_cache as _api_cache
+from scripts.by_hash_batch import ByHashBatcher
 from scripts.civitai_global import print, debug_print
 
 
@@ -37,6 +44,10 @@ try:
     from bs4 import BeautifulSoup
 except ImportError:
     print('Python module "BeautifulSoup" has not been imported correctly, please try to restart or install it manually.')
+try:
+    from blake3 import blake3  # Optional — adds BLAKE3 to the single-pass multi-digest hashing
+except ImportError:
+    blake3 = None
 
 gl.init()
 
@@ -515,59 +526,49 @@ def delete_installed_by_sha256(sha256, delete_finish=None):
                 folders_to_check.append(folder)
     
     deleted = False
-    for model_folder in folders_to_check:
-        if deleted:
-            break
-        for root, _, files in os.walk(model_folder, followlinks=True):
-            for file in files:
-                if file.endswith('.json'):
-                    file_path = os.path.join(root, file)
-                    data = _api.safe_json_load(file_path)
-                    if not data:
-                        continue
-                    
-                    file_sha256 = data.get('sha256', '').upper()
-                    if file_sha256 == sha256_upper:
-                        # Found matching model!
-                        model_name = data.get('model', {}).get('name', 'Unknown Model')
-                        print(f"Found model to delete: {model_name} (SHA256: {sha256_upper})")
-                        
-                        # Find the model file that shares the same base name as this
-                        # JSON sidecar. The saved JSON has no 'file.name' key, so we
-                        # scan the directory directly using a full path (json_base is
-                        # just a filename — joining with root is required for exists()).
-                        json_base = os.path.splitext(file)[0]
-                        model_extensions = ['.safetensors', '.ckpt', '.pt', '.pth', '.bin', '.zip', '.vae', '.th']
-                        model_filename = ''
-                        for ext in model_extensions:
-                            candidate = os.path.join(root, json_base + ext)
-                            if os.path.exists(candidate):
-                                model_filename = os.path.basename(candidate)
-                                break
-                        
-                        if model_filename:
-                            # Delete model file
-                            model_file_path = os.path.join(root, model_filename)
-                            if os.path.exists(model_file_path):
-                                try:
-                                    send2trash(model_file_path)
-                                    print(f"Model moved to trash: {model_file_path}")
-                                except:
-                                    os.remove(model_file_path)
-                                    print(f"Model deleted: {model_file_path}")
-                                
-                                # Delete associated files
-                                base_filename = os.path.splitext(model_filename)[0]
-                                delete_associated_files(root, base_filename)
-                                
-                                deleted = True
-                                break
-                        else:
-                            print(f"Could not find model file for JSON: {file_path}")
-            
-            if deleted:
+    for root, file in _index.find_by_sha256(folders_to_check, sha256_upper):
+        file_path = os.path.join(root, file)
+        data = _api.safe_json_load(file_path)
+        if not data:
+            continue
+
+        # Found matching model!
+        model_name = data.get('model', {}).get('name', 'Unknown Model')
+        print(f"Found model to delete: {model_name} (SHA256: {sha256_upper})")
+
+        # Find the model file that shares the same base name as this
+        # JSON sidecar. The saved JSON has no 'file.name' key, so we
+        # scan the directory directly using a full path (json_base is
+        # just a filename — joining with root is required for exists()).
+        json_base = os.path.splitext(file)[0]
+        model_extensions = ['.safetensors', '.ckpt', '.pt', '.pth', '.bin', '.zip', '.vae', '.th']
+        model_filename = ''
+        for ext in model_extensions:
+            candidate = os.path.join(root, json_base + ext)
+            if os.path.exists(candidate):
+                model_filename = os.path.basename(candidate)
                 break
-    
+
+        if model_filename:
+            # Delete model file
+            model_file_path = os.path.join(root, model_filename)
+            if os.path.exists(model_file_path):
+                try:
+                    send2trash(model_file_path)
+                    print(f"Model moved to trash: {model_file_path}")
+                except:
+                    os.remove(model_file_path)
+                    print(f"Model deleted: {model_file_path}")
+
+                # Delete associated files
+                base_filename = os.path.splitext(model_filename)[0]
+                delete_associated_files(root, base_filename)
+
+                deleted = True
+                break
+        else:
+            print(f"Could not find model file for JSON: {file_path}")
+
     if deleted:
         print(f"Successfully deleted model with SHA256: {sha256_upper}")
     else:
@@ -607,6 +608,8 @@ def delete_associated_files(directory, base_name):
                     os.remove(file_path)
                     print(f"Image deleted: {file_path}")
 
+    _index.refresh_dir(directory)
+
 
 def _trash_associated_files(directory, base_name, trash_dir):
     """Moves related model files to the _Trash folder alongside the main file."""
@@ -640,6 +643,9 @@ def _trash_associated_files(directory, base_name, trash_dir):
                 shutil.move(file_path, dest)
                 print(f'[Retention] Moved adjacent image to _Trash: {dest}')
 
+    _index.refresh_dir(directory)
+    _index.refresh_dir(trash_dir)
+
 
 def _resize_image_bytes(image_bytes, target_size=512):
     """Resize image bytes to target_size on the longer side, keeping aspect ratio"""
@@ -683,7 +689,7 @@ def save_preview(file_path, api_response, overwrite_toggle=False, sha256=None):
                     for image in version['images']:
                         if image['type'] == 'image':
                             url_with_width = re.sub(r'/width=\d+', f"/width={image['width']}", image['url'])
-                            response = requests.get(url_with_width, proxies=proxies, verify=ssl)
+                            response = _http.get(url_with_width, proxies=proxies, verify=ssl)
 
                             if response.status_code == 200:
                                 # Check if resize is enabled for saved previews
@@ -758,50 +764,46 @@ def save_images(preview_html, model_filename, install_path, sub_folder, api_resp
 
     name = os.path.splitext(model_filename)[0]
 
-    # Setup download
-    opener = urllib.request.build_opener()
-    opener.addheaders = [('User-agent', 'Mozilla/5.0')]
-    urllib.request.install_opener(opener)
-
     # Download images
     downloaded_count = 0
     for i, img_url in enumerate(img_urls):
         filename = f"{name}_{i}.png"
         img_url = urllib.parse.quote(img_url, safe=':/=')
         try:
-            with urllib.request.urlopen(img_url) as url:
-                image_data = url.read()
-
-                # Check if resize is enabled for saved images
-                resize_saved = getattr(opts, 'resize_preview_on_save', True)
-                if resize_saved:
-                    resize_size = getattr(opts, 'resize_preview_size', 512)
-                    image_data = _resize_image_bytes(image_data, resize_size)
-
-                img = Image.open(io.BytesIO(image_data))
-
-                if img.mode in ('RGBA', 'LA', 'P'):
-                    pass  # Keep transparency
-                elif img.mode != 'RGB':
-                    img = img.convert('RGB')
-
-                save_path = os.path.join(image_path, filename)
-
-                if IS_KAGGLE:
-                    import sd_image_encryption
-                    imginfo = img.info or {}
-                    if not all(key in imginfo for key in ['Encrypt', 'EncryptPwdSha']):
-                        sd_image_encryption.EncryptedImage.from_image(img).save(save_path)
-                    else:
-                        img.save(save_path, 'PNG')
+            response = _http.get(img_url, headers={'User-Agent': 'Mozilla/5.0'})
+            response.raise_for_status()
+            image_data = response.content
+
+            # Check if resize is enabled for saved images
+            resize_saved = getattr(opts, 'resize_preview_on_save', True)
+            if resize_saved:
+                resize_size = getattr(opts, 'resize_preview_size', 512)
+                image_data = _resize_image_bytes(image_data, resize_size)
+
+            img = Image.open(io.BytesIO(image_data))
+
+            if img.mode in ('RGBA', 'LA', 'P'):
+                pass  # Keep transparency
+            elif img.mode != 'RGB':
+                img = img.convert('RGB')
+
+            save_path = os.path.join(image_path, filename)
+
+            if IS_KAGGLE:
+                import sd_image_encryption
+                imginfo = img.info or {}
+                if not all(key in imginfo for key in ['Encrypt', 'EncryptPwdSha']):
+                    sd_image_encryption.EncryptedImage.from_image(img).save(save_path)
                 else:
                     img.save(save_path, 'PNG')
+            else:
+                img.save(save_path, 'PNG')
 
-                print(f"Downloaded image: {filename}")
-                downloaded_count += 1
+            print(f"Downloaded image: {filename}")
+            downloaded_count += 1
 
-        except urllib.error.URLError as e:
-            print(f"Error downloading {filename}: {e.reason}")
+        except requests.exceptions.RequestException as e:
+            print(f"Error downloading {filename}: {e}")
         except Exception as e:
             print(f"Error processing image {filename}: {e}")
 
@@ -947,45 +949,175 @@ def _build_local_fallback_browser_item(file_path):
         }]
     }
 
-def gen_sha256(file_path):
-    json_file = os.path.splitext(file_path)[0] + '.json'
 
-    if os.path.exists(json_file):
-        data = _api.safe_json_load(json_file)
-        if data and 'sha256' in data and data['sha256']:
-            return data['sha256']
+class HashCancelled(Exception):
+    """Raised inside gen_sha256 when a parallel hashing run is cancelled mid-file."""
 
-    def read_chunks(file, size=io.DEFAULT_BUFFER_SIZE):
-        while True:
-            chunk = file.read(size)
-            if not chunk:
-                break
-            yield chunk
 
+def compute_file_digests(file_path, cancel_event=None):
+    """
+    Read a file once and compute every CivitAI hash type we support in the same pass:
+    SHA256, AutoV2 (first 10 chars of SHA256), CRC32 and BLAKE3 (if the blake3 module is installed).
+    Values are uppercase, matching the 'hashes' block of the CivitAI API.
+    """
     blocksize = 1 << 20
-    h = hashlib.sha256()
-    length = 0
+    sha = hashlib.sha256()
+    crc = 0
+    b3 = blake3() if blake3 is not None else None
     with open(os.path.realpath(file_path), 'rb') as f:
-        for block in read_chunks(f, size=blocksize):
-            length += len(block)
-            h.update(block)
+        while True:
+            if cancel_event is not None and cancel_event.is_set():
+                raise HashCancelled(file_path)
+            block = f.read(blocksize)
+            if not block:
+                break
+            sha.update(block)
+            crc = zlib.crc32(block, crc)
+            if b3 is not None:
+                b3.update(block)
+
+    sha256 = sha.hexdigest().upper()
+    digests = {
+        'SHA256': sha256,
+        'AutoV2': sha256[:10],
+        'CRC32': f'{crc & 0xFFFFFFFF:08X}',
+    }
+    if b3 is not None:
+        digests['BLAKE3'] = b3.hexdigest().upper()
+    return digests
+
+
+_FINGERPRINT_BLOCK = 1 << 20
+
+
+def quick_fingerprint(file_path, block_size=_FINGERPRINT_BLOCK):
+    """
+    Cheap content fingerprint: file size + BLAKE2b of the head, middle and tail blocks.
+    Reads at most 3 blocks, so it costs milliseconds even for multi-GB checkpoints.
+    Small files (<= 3 blocks) are hashed whole, which makes the fingerprint exact.
+    """
+    path = os.path.realpath(file_path)
+    size = os.path.getsize(path)
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        if size <= 3 * block_size:
+            h.update(f.read())
+        else:
+            for offset in (0, (size - block_size) // 2, size - block_size):
+                f.seek(offset)
+                h.update(f.read(block_size))
+    return f'{size}:{h.hexdigest()}'
+
+
+_sidecar_locks = {}
+_sidecar_locks_lock = threading.Lock()
+
 
-    hash_value = h.hexdigest()
+def _sidecar_lock(json_file):
+    """Per-sidecar lock: x.safetensors and x.ckpt share x.json, so parallel
+    hash workers must not interleave their read-modify-write of it."""
+    key = os.path.normcase(os.path.abspath(json_file))
+    with _sidecar_locks_lock:
+        lock = _sidecar_locks.get(key)
+        if lock is None:
+            lock = _sidecar_locks[key] = threading.Lock()
+        return lock
+
+
+def gen_sha256(file_path, cancel_event=None):
+    json_file = os.path.splitext(file_path)[0] + '.json'
 
     if os.path.exists(json_file):
         data = _api.safe_json_load(json_file)
-        if data:
-            data['sha256'] = hash_value
+        if data and 'sha256' in data and data['sha256']:
+            return data['sha256']
+
+    # Same file (by device/inode/size/mtime) hashed before — possibly under another name
+    digests = _index.lookup_hashes(file_path)
+
+    if not digests:
+        # Same content known under another identity (copied / moved across devices)?
+        # Sampled fingerprints only count when the mtime was preserved too: a
+        # rewrite outside the sampled blocks always changes it.
+        fingerprint = quick_fingerprint(file_path)
+        stat = os.stat(os.path.realpath(file_path))
+        exact = stat.st_size <= 3 * _FINGERPRINT_BLOCK
+        digests = _index.lookup_fingerprint(fingerprint, None if exact else stat.st_mtime_ns)
+        if digests:
+            debug_print(f"Reused cached hash for '{os.path.basename(file_path)}' (quick fingerprint match)")
         else:
-            data = {'sha256': hash_value}
-    else:
-        data = {'sha256': hash_value}
+            digests = compute_file_digests(file_path, cancel_event)
+        _index.store_hash(file_path, digests['SHA256'], digests, fingerprint)
 
-    _api.safe_json_save(json_file, data)
+    hash_value = digests['SHA256'].lower()
+
+    with _sidecar_lock(json_file):
+        if os.path.exists(json_file):
+            data = _api.safe_json_load(json_file)
+            if not data:
+                data = {}
+        else:
+            data = {}
+
+        data['sha256'] = hash_value
+        data['hashes'] = {**(data.get('hashes') or {}), **digests}
+
+        _api.safe_json_save(json_file, data)
 
     return hash_value
 
 
+def _sidecar_has_sha256(file_path):
+    data = _api.safe_json_load(os.path.splitext(file_path)[0] + '.json')
+    return bool(data and isinstance(data, dict) and data.get('sha256'))
+
+
+def hash_files_parallel(file_paths, progress=None):
+    """
+    Hash every file that has no SHA256 yet, using a pool of worker threads.
+    hashlib releases the GIL while digesting, so readers run truly in parallel;
+    the pool size (civitai_neo_hash_workers) bounds concurrent disk readers.
+    Progress is reported from the calling thread; gl.cancel_status stops the
+    pool (in-flight files abort between blocks).
+    Returns False when cancelled, True otherwise.
+    """
+    pending = [f for f in file_paths if not _sidecar_has_sha256(f)]
+    if not pending:
+        return True
+
+    workers = max(1, int(getattr(opts, 'civitai_neo_hash_workers', 4) or 1))
+    total = len(pending)
+    done = 0
+    cancel_event = threading.Event()
+    print(f"Hashing {total} file(s) with {min(workers, total)} worker(s)...")
+
+    def _worker(file_path):
+        try:
+            gen_sha256(file_path, cancel_event)
+        except HashCancelled:
+            pass
+        except Exception as e:
+            print(f"Failed to hash '{os.path.basename(file_path)}': {e}")
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='neo-hash') as pool:
+        futures = {pool.submit(_worker, f): f for f in pending}
+        not_done = set(futures)
+        while not_done:
+            finished, not_done = wait(not_done, timeout=0.5, return_when=FIRST_COMPLETED)
+            if gl.cancel_status:
+                cancel_event.set()
+                for future in not_done:
+                    future.cancel()
+                if progress != None:
+                    progress(done / total, desc='Hashing files cancelled.')
+                return False
+            for future in finished:
+                done += 1
+                if progress != None:
+                    progress(done / total, desc=f"Hashing files... {done}/{total} | {os.path.basename(futures[future])}")
+    return True
+
+
 def _normalize_sha256(sha256_value):
     if not sha256_value:
         return None
@@ -1159,7 +1291,8 @@ def sync_checkpoint_sha256_cache(progress=gr.Progress() if queue else None):
         sidecar = _api.safe_json_load(sidecar_path) if os.path.exists(sidecar_path) else {}
         sidecar = sidecar if isinstance(sidecar, dict) else {}
 
-        sha_from_json = _normalize_sha256(sidecar.get('sha256'))
+        # Sidecar first, then the hash cache (filled by scans / downloads) — never re-read the file
+        sha_from_json = _normalize_sha256(sidecar.get('sha256')) or _normalize_sha256(_index.lookup_hash(file_path))
         if not sha_from_json:
             missing_sha += 1
             continue
@@ -1627,7 +1760,7 @@ def save_model_info(install_path, file_name, sub_folder, sha256=None, preview_ht
                     by_hash_url = f"https://{_api.get_civitai_domain()}/api/v1/model-versions/by-hash/{normalized}"
                     headers = _api.get_headers()
                     proxies, ssl_verify = _api.get_proxies()
-                    resp = requests.get(by_hash_url, headers=headers, timeout=(60, 30), proxies=proxies, verify=ssl_verify)
+                    resp = _http.get(by_hash_url, headers=headers, timeout=(60, 30), proxies=proxies, verify=ssl_verify)
                     if resp.status_code == 200:
                         data = resp.json()
                         if 'error' not in data:
@@ -1855,6 +1988,130 @@ def find_and_save(api_response, sha256=None, file_name=None, json_file=None, no_
 
     return 'not found'
 
+# Requests go through _http.request, i.e. the shared adaptive rate limiter
+_by_hash_batcher = ByHashBatcher(_http.request)
+
+
+def fetch_version_by_hash(sha256, domain=None, headers=None):
+    """
+    Model version for a SHA256 from the by-hash endpoint, through the batching client
+    (concurrent lookups share one request). Fresh API cache entries are used as-is and
+    found versions are cached like request_civit_api() responses; while the circuit
+    breaker is open, stale entries are served too. Versions from the batch POST can
+    be slimmer than a GET's, so they are cached under their own key (url + '#batch'),
+    only consulted after the GET entry.
+    Returns (status_code, data) — data is the version dict on 200, else None.
+    Network errors are raised as requests exceptions.
+    """
+    base_url = domain or f"https://{_api.get_civitai_domain()}"
+    url = f"{base_url}/api/v1/model-versions/by-hash/{sha256}"
+    batch_url = f"{url}#batch"
+    for cache_url in (url, batch_url):
+        cached = _api_cache.lookup(cache_url, headers)
+        if cached and (cached['fresh'] or _http.breaker.is_open()):
+            try:
+                return 200, _http.loads(cached['body'])
+            except ValueError:
+                pass
+
+    proxies, ssl = _api.get_proxies()
+    status, data, batched = _by_hash_batcher.lookup_with_source(base_url, sha256, headers=headers, timeout=(60, 30), proxies=proxies, verify=ssl)
+    if status == 200 and isinstance(data, dict) and 'error' not in data:
+        _api_cache.store(batch_url if batched else url, headers, json.dumps(data).encode('utf-8'))
+    return status, data
+
+
+def resolve_models_parallel(file_paths, gen_hash=None, progress=None):
+    """
+    Run get_models() for every file on a bounded pool of worker threads.
+    Sidecars are written by get_models() exactly as in a serial scan; the
+    by-hash requests share the global rate limiter (_http.limiter), and the
+    pool size (civitai_neo_api_workers) bounds requests in flight.
+    Returns the get_models() results in file order, or None when cancelled.
+    """
+    total = len(file_paths)
+    results = [None] * total
+    if not total:
+        return results
+
+    workers = max(1, int(getattr(opts, 'civitai_neo_api_workers', 4) or 1))
+    done = 0
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='neo-byhash') as pool:
+        resolve = _http.bind_lane(get_models)
+        futures = {pool.submit(resolve, f, gen_hash): i for i, f in enumerate(file_paths)}
+        not_done = set(futures)
+        while not_done:
+            finished, not_done = wait(not_done, timeout=0.5, return_when=FIRST_COMPLETED)
+            if gl.cancel_status:
+                for future in not_done:
+                    future.cancel()
+                if progress != None:
+                    progress(done / total, desc='Processing files cancelled.')
+                return None
+            for future in finished:
+                index = futures[future]
+                try:
+                    results[index] = future.result()
+                except Exception as e:
+                    print(f"An error occurred for {file_paths[index]}: {str(e)}")
+                done += 1
+                if progress != None:
+                    progress(done / total, desc=f"Processing file: {os.path.basename(file_paths[index])}")
+    return results
+
+
+def _walk_model_pages(url, proxies, ssl, pages, stop):
+    """
+    Follow one /models?ids= chunk through its nextPage cursors on a worker
+    thread, handing every response to the `pages` queue as (kind, payload):
+      ('page', items)    200 — the page's items
+      ('page', None)     any other status (counted for progress, skipped)
+      ('failed', text)   503 still returned after the throttle retries
+      ('done', None)     chunk finished
+    Stops early once `stop` is set; requests go through the shared limiter.
+    """
+    def put(message):
+        while not stop.is_set():
+            try:
+                pages.put(message, timeout=0.5)
+                return
+            except _queue.Full:
+                continue
+
+    throttled = 0
+    while url and not stop.is_set():
+        try:
+            response = _http.get(url, timeout=(60, 30), proxies=proxies, verify=ssl)
+            if response.status_code in (429, 503) and throttled < 3:
+                # Same page again once the shared limiter's pause is over
+                throttled += 1
+                continue
+            throttled = 0
+            if response.status_code == 200:
+                page = _http.loads(response.content)
+                url = page.get('metadata', {}).get('nextPage', None)
+                put(('page', page.get('items', [])))
+            elif response.status_code == 503:
+                print(f"Error: Received status code: {response.status_code} with URL: {url}")
+                put(('failed', response.text))
+                return
+            else:
+                print(f"Error: Received status code {response.status_code} with URL: {url}")
+                url = None
+                put(('page', None))
+        except requests.exceptions.Timeout:
+            print(f"Request timed out for {url}. Skipping...")
+            url = None
+        except requests.exceptions.ConnectionError:
+            print('Failed to connect to the API. The servers might be offline.')
+            url = None
+        except Exception as e:
+            print(f"An unexpected error occurred: {e}")
+            url = None
+    put(('done', None))
+
+
 def get_models(file_path, gen_hash=None):
     modelId = None
     modelVersionId = None
@@ -1871,26 +2128,22 @@ def get_models(file_path, gen_hash=None):
         if not sha256 and gen_hash:
             sha256 = gen_sha256(file_path)
 
-        if sha256:
-            by_hash = f"https://{_api.get_civitai_domain()}/api/v1/model-versions/by-hash/{sha256}"
-        else:
+        if not sha256:
             return modelId if modelId else None
 
-    proxies, ssl = _api.get_proxies()
     try:
         if not modelId or not modelVersionId:
-            response = requests.get(by_hash, timeout=(60, 30), proxies=proxies, verify=ssl)
-            if response.status_code == 200:
-                api_response = response.json()
+            status, api_response = fetch_version_by_hash(sha256)
+            if status == 200:
                 if 'error' in api_response:
                     print(f"{file_path}: {api_response['error']}")
                     return None
                 else:
                     modelId = api_response.get('modelId', '')
                     modelVersionId = api_response.get('id', '')
-            elif response.status_code == 503:
+            elif status in (429, 503):
                 return 'offline'
-            elif response.status_code == 404:
+            elif status == 404:
                 modelId = 'Model not found'
                 modelVersionId = 'Model not found'
 
@@ -1961,6 +2214,30 @@ def compare_version_parts(a_parts, b_parts):
     b = b_parts + [0] * (max_len - len(b_parts))
     return (a > b) - (a < b)
 
+def _version_check_fields(model):
+    """
+    Slim copy of a /models item with only what version_match() and
+    collect_update_items() read, so a full update scan does not keep every
+    description and image metadata block in memory.
+    """
+    versions = []
+    for ver in model.get('modelVersions', []) or []:
+        preview = next((img for img in ver.get('images', []) or [] if img.get('url')), None)
+        versions.append({
+            'id': ver.get('id'),
+            'name': ver.get('name', ''),
+            'baseModel': ver.get('baseModel'),
+            'files': [{'hashes': {'SHA256': (f.get('hashes') or {}).get('SHA256', '')}}
+                      for f in ver.get('files', []) or []],
+            'images': [{'url': preview['url']}] if preview else [],
+        })
+    return {
+        'id': model.get('id'),
+        'name': model.get('name', ''),
+        'type': model.get('type', 'Unknown'),
+        'modelVersions': versions,
+    }
+
 def version_match(file_paths, api_response, log=False):
     """
     Check which installed models have a newer version available on CivitAI.
@@ -2273,6 +2550,7 @@ def get_save_path_and_name(install_path, file_name, api_response, sub_folder=Non
     return save_path, name
 
 ## === ANXETY EDITs ===
+@_http.background_lane
 def file_scan(folders, tag_finish, ver_finish, installed_finish, preview_finish, organize_finish, overwrite_toggle, tile_count, gen_hash, create_html, progress=gr.Progress() if queue else None):
     global no_update
     proxies, ssl = _api.get_proxies()
@@ -2332,7 +2610,6 @@ def file_scan(folders, tag_finish, ver_finish, installed_finish, preview_finish,
                 folders_to_check.append(folder)
 
     total_files = 0
-    files_done = 0
 
     files = list_files(folders_to_check)
     total_files += len(files)
@@ -2348,27 +2625,32 @@ def file_scan(folders, tag_finish, ver_finish, installed_finish, preview_finish,
             gr.update(value=number)
         )
 
+    if gen_hash and not hash_files_parallel(files, progress):
+        no_update = True
+        gl.scan_files = False
+        time.sleep(2)
+        return (
+            gr.update(value='<div style="min-height: 0px;"></div>'),
+            gr.update(value=number)
+        )
+
     all_model_ids = []
     file_paths = []
     all_ids = []
     local_fallback_items = []
 
-    for file_path in files:
-        if gl.cancel_status:
-            if progress != None:
-                progress(files_done / total_files, desc='Processing files cancelled.')
-            no_update = True
-            gl.scan_files = False
-            time.sleep(2)
-            return (
-                gr.update(value='<div style="min-height: 0px;"></div>'),
-                gr.update(value=number)
-            )
-        file_name = os.path.basename(file_path)
-        if progress != None:
-            progress(files_done / total_files, desc=f"Processing file: {file_name}")
+    model_ids = resolve_models_parallel(files, gen_hash, progress)
+    if model_ids is None:
+        no_update = True
+        gl.scan_files = False
+        time.sleep(2)
+        return (
+            gr.update(value='<div style="min-height: 0px;"></div>'),
+            gr.update(value=number)
+        )
 
-        model_id = get_models(file_path, gen_hash)
+    for file_path, model_id in zip(files, model_ids):
+        file_name = os.path.basename(file_path)
         if model_id == 'offline':
             print('The CivitAI servers did not respond, unable to retrieve Model ID')
         elif model_id == 'Model not found':
@@ -2383,12 +2665,9 @@ def file_scan(folders, tag_finish, ver_finish, installed_finish, preview_finish,
             print(f"model ID not found for: '{file_name}'")
             if from_installed:
                 local_fallback_items.append(_build_local_fallback_browser_item(file_path))
-        files_done += 1
 
     gl.local_browser_fallback_items = local_fallback_items
 
-    all_items = []
-
     all_model_ids = list(set(all_model_ids))
 
     if not all_model_ids and not local_fallback_items:
@@ -2415,59 +2694,168 @@ def file_scan(folders, tag_finish, ver_finish, installed_finish, preview_finish,
         url_count = len(all_model_ids) // 100
         if len(all_model_ids) % 100 != 0:
             url_count += 1
+
+        # Each page is consumed as it arrives and then dropped: the update check
+        # keeps only the fields it compares, tag / preview saving handles the
+        # files of every returned model right away.
+        files_by_model = {}
+        for file_path, id_value in zip(file_paths, all_ids):
+            files_by_model.setdefault(str(id_value), []).append((file_path, id_value))
+        version_items = []
+        items_seen = 0
+        files_done = 0
+        file_count = len(file_paths)
+
+        def save_tags(file_path, id_value, model_response):
+            nonlocal files_done
+            install_path, file_name = os.path.split(file_path)
+            name = os.path.splitext(file_name)[0]
+            try:
+                save_path, name = get_save_path_and_name(install_path, file_name, model_response)
+
+                # Get SHA256 hash for the file to find the specific version
+                file_sha256 = None
+                json_file = os.path.splitext(file_path)[0] + '.json'
+                if os.path.exists(json_file):
+                    data = _api.safe_json_load(json_file)
+                    file_sha256 = data.get('sha256') if data else None
+
+                # If SHA256 not cached in .json, compute it now and save it
+                # This ensures we always match the exact version (not just by filename)
+                if not file_sha256 and os.path.exists(file_path):
+                    try:
+                        file_sha256 = gen_sha256(file_path)
+                    except Exception:
+                        pass
+
+                # Find the specific model version based on SHA256 or filename
+                if file_sha256:
+                    model_version, item = find_model_version_by_sha256(model_response, file_sha256)
+                else:
+                    model_version, item = find_model_version_by_filename(model_response, file_name)
+
+                html_path = os.path.join(save_path, f'{name}.html')
+
+                if create_html and not os.path.exists(html_path) or create_html and overwrite_toggle:
+                    if model_version and item:
+                        # Use the specific model version name for HTML generation
+                        preview_html = _api.update_model_info(None, model_version.get('name'), True, id_value, model_response, True)
+                    else:
+                        # Fallback to first version if specific version not found
+                        model_versions = _api.update_model_versions(id_value, model_response)
+                        preview_html = _api.update_model_info(None, model_versions.get('value'), True, id_value, model_response, True)
+                else:
+                    preview_html = None
+
+                files_done += 1
+                if progress != None:
+                    progress(
+                        files_done / file_count,
+                        desc=f"Saving tags{' & HTML' if preview_html else ''}... {files_done}/{file_count} | {name}"
+                    )
+                sub_folder = os.path.normpath(os.path.relpath(install_path, gl.main_folder))
+                save_model_info(install_path, file_name, sub_folder, sha256=file_sha256, preview_html=preview_html, api_response=model_response, overwrite_toggle=overwrite_toggle)
+
+            except Exception as e:
+                print(f"Error processing model {file_name}: {e}")
+                files_done += 1
+                if progress != None:
+                    progress(
+                        files_done / file_count,
+                        desc=f"Skipped {name} due to error... {files_done}/{file_count}"
+                    )
+
+        def save_previews(file_path, model_response):
+            nonlocal files_done
+            name = os.path.splitext(os.path.basename(file_path))[0]
+            files_done += 1
+            if progress != None:
+                progress(
+                    files_done / file_count,
+                    desc=f"Saving preview images... {files_done}/{file_count} | {name}"
+                )
+            try:
+                save_preview(file_path, model_response, overwrite_toggle)
+            except Exception as e:
+                print(f"Error saving preview for {name}: {e}")
+
+        def consume_page(page_items):
+            for model in page_items:
+                if from_ver:
+                    version_items.append(_version_check_fields(model))
+                elif from_tag or from_preview:
+                    model_response = {'items': [model]}
+                    for file_path, id_value in files_by_model.pop(str(model.get('id')), ()):
+                        if from_tag:
+                            save_tags(file_path, id_value, model_response)
+                        else:
+                            save_previews(file_path, model_response)
+
         url_done = 0
-        api_response = {}
-        for url in url_list:
-            while url:
-                try:
-                    if progress != None:
-                        progress(url_done / url_count, desc=f"Sending API request... {url_done}/{url_count}")
-                    response = requests.get(url, timeout=(60, 30), proxies=proxies, verify=ssl)
-                    if response.status_code == 200:
-                        api_response_json = response.json()
-                        all_items.extend(api_response_json['items'])
-                        metadata = api_response_json.get('metadata', {})
-                        url = metadata.get('nextPage', None)
-                    elif response.status_code == 503:
-                        print(f"Error: Received status code: {response.status_code} with URL: {url}")
-                        print(response.text)
-                        return (
-                            gr.update(value=_api.api_error_msg('error')),
-                            gr.update(value=number)
-                        )
+        if progress != None:
+            progress(0, desc=f"Sending API request... {url_done}/{url_count}")
+
+        # One page walk per chunk, in parallel; pages are consumed here, in arrival order
+        workers = max(1, int(getattr(opts, 'civitai_neo_api_workers', 4) or 1))
+        pages = _queue.Queue(maxsize=workers * 2)
+        stop = threading.Event()
+        failed = None
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, len(url_list))), thread_name_prefix='neo-pages') as pool:
+            walk = _http.bind_lane(_walk_model_pages)
+            for url in url_list:
+                pool.submit(walk, url, proxies, ssl, pages, stop)
+            walking = len(url_list)
+            try:
+                while walking:
+                    kind, payload = pages.get()
+                    if kind == 'done':
+                        walking -= 1
+                    elif kind == 'failed':
+                        failed = payload
+                        break
                     else:
-                        print(f"Error: Received status code {response.status_code} with URL: {url}")
-                        url = None
-                    url_done += 1
-                except requests.exceptions.Timeout:
-                    print(f"Request timed out for {url}. Skipping...")
-                    url = None
-                except requests.exceptions.ConnectionError:
-                    print('Failed to connect to the API. The servers might be offline.')
-                    url = None
-                except Exception as e:
-                    print(f"An unexpected error occurred: {e}")
-                    url = None
+                        url_done += 1
+                        if progress != None:
+                            progress(min(url_done / url_count, 1), desc=f"Sending API request... {url_done}/{url_count}")
+                        if payload:
+                            items_seen += len(payload)
+                            consume_page(payload)
+            finally:
+                stop.set()
+
+        if failed is not None:
+            print(failed)
+            return (
+                gr.update(value=_api.api_error_msg('error')),
+                gr.update(value=number)
+            )
 
-        api_response['items'] = all_items
-        if api_response['items'] == []:
+        if items_seen == 0:
             return (
                 gr.update(value=_api.api_error_msg('no_items')),
                 gr.update(value=number)
             )
 
+        if from_tag or from_preview:
+            # Models missing from every page: nothing to save for their files
+            for pairs in files_by_model.values():
+                for file_path, _ in pairs:
+                    print(f"No API data returned for: {os.path.basename(file_path)}")
+
+        update_response = {'items': version_items}
+
     if progress != None:
         progress(1, desc='Processing final results...')
 
     if from_ver:
-        updated_models, outdated_models = version_match(file_paths, api_response)
+        updated_models, outdated_models = version_match(file_paths, update_response)
 
         updated_set = set(updated_models)
         outdated_set = set(outdated_models)
         outdated_set = {model for model in outdated_set if model[0] not in {updated_model[0] for updated_model in updated_set}}
 
         # Collect per-family detail for Update Mode cards
-        gl.update_items = collect_update_items(outdated_set, api_response, file_paths)
+        gl.update_items = collect_update_items(outdated_set, update_response, file_paths)
 
         all_model_ids = [model[0] for model in outdated_set]
         all_model_names = [model[1] for model in outdated_set]
@@ -2525,68 +2913,6 @@ def file_scan(folders, tag_finish, ver_finish, installed_finish, preview_finish,
         )
 
     elif from_tag:
-        completed_tags = 0
-        tag_count = len(file_paths)
-
-        for file_path, id_value in zip(file_paths, all_ids):
-            install_path, file_name = os.path.split(file_path)
-
-            try:
-                save_path, name = get_save_path_and_name(install_path, file_name, api_response)
-
-                # Get SHA256 hash for the file to find the specific version
-                file_sha256 = None
-                json_file = os.path.splitext(file_path)[0] + '.json'
-                if os.path.exists(json_file):
-                    data = _api.safe_json_load(json_file)
-                    file_sha256 = data.get('sha256') if data else None
-
-                # If SHA256 not cached in .json, compute it now and save it
-                # This ensures we always match the exact version (not just by filename)
-                if not file_sha256 and os.path.exists(file_path):
-                    try:
-                        file_sha256 = gen_sha256(file_path)
-                    except Exception:
-                        pass
-
-                # Find the specific model version based on SHA256 or filename
-                if file_sha256:
-                    model_version, item = find_model_version_by_sha256(api_response, file_sha256)
-                else:
-                    model_version, item = find_model_version_by_filename(api_response, file_name)
-
-                html_path = os.path.join(save_path, f'{name}.html')
-
-                if create_html and not os.path.exists(html_path) or create_html and overwrite_toggle:
-                    if model_version and item:
-                        # Use the specific model version name for HTML generation
-                        preview_html = _api.update_model_info(None, model_version.get('name'), True, id_value, api_response, True)
-                    else:
-                        # Fallback to first version if specific version not found
-                        model_versions = _api.update_model_versions(id_value, api_response)
-                        preview_html = _api.update_model_info(None, model_versions.get('value'), True, id_value, api_response, True)
-                else:
-                    preview_html = None
-
-                completed_tags += 1
-                if progress != None:
-                    progress(
-                        completed_tags / tag_count,
-                        desc=f"Saving tags{' & HTML' if preview_html else ''}... {completed_tags}/{tag_count} | {name}"
-                    )
-                sub_folder = os.path.normpath(os.path.relpath(install_path, gl.main_folder))
-                save_model_info(install_path, file_name, sub_folder, sha256=file_sha256, preview_html=preview_html, api_response=api_response, overwrite_toggle=overwrite_toggle)
-
-            except Exception as e:
-                print(f"Error processing model {file_name}: {e}")
-                completed_tags += 1
-                if progress != None:
-                    progress(
-                        completed_tags / tag_count,
-                        desc=f"Skipped {name} due to error... {completed_tags}/{tag_count}"
-                    )
-                continue  # Skip this model and continue with the next
-
         if progress != None:
             progress(1, desc='All tags succesfully saved!')
         gl.scan_files = False
@@ -2597,18 +2923,6 @@ def file_scan(folders, tag_finish, ver_finish, installed_finish, preview_finish,
         )
 
     elif from_preview:
-        completed_preview = 0
-        preview_count = len(file_paths)
-        for file in file_paths:
-            _, file_name = os.path.split(file)
-            name = os.path.splitext(file_name)[0]
-            completed_preview += 1
-            if progress != None:
-                progress(
-                    completed_preview / preview_count,
-                    desc=f"Saving preview images... {completed_preview}/{preview_count} | {name}"
-                )
-            save_preview(file, api_response, overwrite_toggle)
         gl.scan_files = False
         return (
             gr.update(value='<div style="min-height: 0px;"></div>'),
@@ -2901,16 +3215,12 @@ def _fetch_api_info_by_hash(file_path, api_info_file):
         _debug_log(f"Invalid SHA256 for: {model_name}")
         return None
 
-    api_url = f"https://{_api.get_civitai_domain()}/api/v1/model-versions/by-hash/{normalized}"
-    _debug_log(f"API call: {api_url}")
+    _debug_log(f"API call: by-hash/{normalized}")
 
     try:
-        headers = _api.get_headers()
-        proxies, ssl = _api.get_proxies()
-        response = requests.get(api_url, headers=headers, timeout=(60, 30), proxies=proxies, verify=ssl)
+        status, data = fetch_version_by_hash(normalized, headers=_api.get_headers())
 
-        if response.status_code == 200:
-            data = response.json()
+        if status == 200:
             if 'error' in data:
                 _debug_log(f"API returned error for {model_name}: {data.get('error')}")
                 return None
@@ -2936,11 +3246,11 @@ def _fetch_api_info_by_hash(file_path, api_info_file):
 
             return data
 
-        elif response.status_code == 404:
+        elif status == 404:
             _debug_log(f"Model not found on CivitAI for hash {normalized} ({model_name})")
             return None
         else:
-            _debug_log(f"API returned HTTP {response.status_code} for: {model_name}")
+            _debug_log(f"API returned HTTP {status} for: {model_name}")
             return None
 
     except Exception as e:
@@ -3068,6 +3378,7 @@ def get_model_info_for_organization(file_path):
     print(f"[CivitAI Browser Neo] ⚠️ Could not determine baseModel for: {model_name}")
     return None, model_name
 
+@_http.background_lane
 def analyze_organization_plan(folders, progress=None):
     """
     Analyze current model files and create an organization plan
@@ -3429,6 +3740,9 @@ def execute_rollback(progress=None):
                         except Exception as e:
                             debug_print(f"Could not rollback {suffixed_source}: {e}")
             
+            _index.refresh_path(source_path)
+            _index.refresh_path(target_path)
+
             print(f"✓ Rolled back: {model_name}")
             
         except Exception as e:
@@ -3498,6 +3812,9 @@ def _move_associated_files(source_path, target_path):
                 except Exception as e:
                     debug_print(f"Could not move associated file {associated_file}: {e}")
 
+    _index.refresh_path(source_path)
+    _index.refresh_path(target_path)
+
 
 def _make_progress_bar_html(done, total, label):
     """Return an inline HTML progress bar used by generator functions."""
@@ -66,6 +66,9 @@ def saveSettings(ust, ct, pt, st, bf, cj, ol, hi, olf, sn, es, ss, ts):
 def all_visible(html_check):
     # Count the number of model-checkbox occurrences in the HTML
     checkbox_count = html_check.count('model-checkbox')
+    # Client-side rendering: the cards are still a JSON payload at this point
+    if not checkbox_count:
+        checkbox_count = _api.client_card_count(html_check)
     # Show the button only if there are 2 or more checkboxes (more than 1 model to select)
     return gr.update(visible=checkbox_count >= 2)
 
@@ -338,7 +341,7 @@ def on_ui_tabs():
                     btn_ban = gr.Button(value='\U0001f6ab Ban', interactive=False, scale=1, min_width=90)
                     btn_clear = gr.Button(value='\u21ba Reset', interactive=False, scale=1, min_width=90)
             with gr.Row():
-                list_html = gr.HTML(value='<div style="font-size: 24px; text-align: center; margin: 50px;">Click the search icon to load models.<br>Use the filter icon to filter results.</div>')
+                list_html = gr.HTML(value='<div style="font-size: 24px; text-align: center; margin: 50px;">Click the search icon to load models.<br>Use the filter icon to filter results.</div>', elem_id='civitai_list_html')
             with gr.Row():
                 download_progress = gr.HTML(value='<div style="min-height: 0px;"></div>', elem_id='DownloadProgress')
             with gr.Row():
@@ -1241,17 +1244,21 @@ def on_ui_tabs():
 
         # Page Button Functions #
 
+        # Streams placeholders into the visible grid first; generators need the Gradio queue
+        load_page = _api.initial_model_page_stream if _file.queue else _api.initial_model_page
+
         page_btn_list = {
-            refresh.click: (_api.initial_model_page, True),
-            search_term.submit: (_api.initial_model_page, True),
-            page_slider_trigger.change: (_api.initial_model_page, False),
+            refresh.click: (load_page, True),
+            search_term.submit: (load_page, True),
+            page_slider_trigger.change: (load_page, False),
             get_next_page.click: (_api.next_model_page, False),
             get_prev_page.click: (_api.prev_model_page, False)
         }
 
         for trigger, (function, use_refresh_inputs) in page_btn_list.items():
             inputs_to_use = refresh_inputs if use_refresh_inputs else page_inputs
-            trigger(fn=function, inputs=inputs_to_use, outputs=page_outputs)
+            outputs_to_use = page_outputs + [list_html] if function is _api.initial_model_page_stream else page_outputs
+            trigger(fn=function, inputs=inputs_to_use, outputs=outputs_to_use)
             trigger(fn=None, _js='() => multi_model_select()')
 
         for button in cancel_btn_list:
@@ -1870,6 +1877,68 @@ def on_ui_settings():
         ).info('Not recommended for security, may be required if you do not have the correct CA Bundle available')
     )
 
+    shared.opts.add_option(
+        'civitai_neo_api_cache',
+        shared.OptionInfo(
+            default=True,
+            label='Cache API responses on disk',
+            section=browser,
+            category_id=cat_id
+        ).info('Serves recently fetched search pages and model / version info from config_states/neo_api_cache.db. Stale entries are revalidated with CivitAI before reuse')
+    )
+
+    shared.opts.add_option(
+        'civitai_neo_api_cache_size',
+        shared.OptionInfo(
+            default=64,
+            label='API response cache size (MB)',
+            component=gr.Slider,
+            component_args=lambda: {'maximum': '1024', 'minimum': '8', 'step': '8'},
+            section=browser,
+            category_id=cat_id
+        ).info('Least recently used responses are dropped once the cache grows past this size')
+    )
+
+    shared.opts.add_option(
+        'civitai_neo_prefetch_next_page',
+        shared.OptionInfo(
+            default=True,
+            label='Prefetch the next browser page',
+            section=browser,
+            category_id=cat_id
+        ).info('Loads the next page of results in the background while you look at the current one, so Next responds without waiting for CivitAI')
+    )
+
+    shared.opts.add_option(
+        'civitai_neo_prerender_next_page',
+        shared.OptionInfo(
+            default=False,
+            label='Pre-render cards of the prefetched page',
+            section=browser,
+            category_id=cat_id
+        ).info('Also builds the model cards of the next page in the background. Uses some CPU while browsing; cards are rebuilt if installed models or card settings changed meanwhile')
+    )
+
+    shared.opts.add_option(
+        'civitai_neo_progressive_render',
+        shared.OptionInfo(
+            default=True,
+            label='Progressive card rendering',
+            section=browser,
+            category_id=cat_id
+        ).info('Shows placeholder cards while a page is requested, then cards as they are built; install badges and filters apply once local models have been checked. Requires the Gradio queue')
+    )
+
+    shared.opts.add_option(
+        'civitai_neo_client_render',
+        shared.OptionInfo(
+            default=False,
+            label='Client-side card rendering',
+            section=browser,
+            category_id=cat_id
+        ).info('Sends cards as compact JSON and builds them in the browser, for smaller page payloads and less server work')
+    )
+
     shared.opts.add_option(
         'civitai_debug_prints',
         shared.OptionInfo(
@@ -2130,6 +2199,30 @@ def on_ui_settings():
         ).info('When enabled, the delete shortcut on outdated cards hides automatically if the selected version in the panel is not the installed one. Requires UI reload.')
     )
 
+    shared.opts.add_option(
+        'civitai_neo_hash_workers',
+        shared.OptionInfo(
+            default=4,
+            label='Parallel hashing workers',
+            component=gr.Slider,
+            component_args=lambda: {'maximum': '16', 'minimum': '1', 'step': '1'},
+            section=organization,
+            category_id=cat_id
+        ).info('Number of files hashed at the same time during scans with One-Time Hash Generation. Use 1 for spinning hard drives, higher values for SSD/NVMe')
+    )
+
+    shared.opts.add_option(
+        'civitai_neo_api_workers',
+        shared.OptionInfo(
+            default=4,
+            label='Parallel API lookups during scans',
+            component=gr.Slider,
+            component_args=lambda: {'maximum': '16', 'minimum': '1', 'step': '1'},
+            section=organization,
+            category_id=cat_id
+        ).info('Number of files resolved against CivitAI (by SHA256), and of model ID chunks paged, at the same time. Requests are rate limited regardless of this value')
+    )
+
     shared.opts.add_option(
         'civitai_neo_model_categories',
         shared.OptionInfo(
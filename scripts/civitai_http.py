@@ -0,0 +1,409 @@
+"""
+CivitAI HTTP Layer
+
+One shared requests.Session for every outgoing CivitAI call (API pages, by-hash
+lookups, download-link resolution, preview and gallery image fetches), so TLS
+connections are kept alive and reused across calls and threads instead of being
+re-negotiated per request.
+
+  - Connection pools are kept per host (civitai.com, civitai.red, image CDN…);
+    urllib3 pools are thread-safe, so scan / hashing workers share them.
+  - Proxy and SSL settings are read from _api.get_proxies() on every request,
+    so changes in Settings apply without a restart.
+  - Cookies are never stored: every call stays as stateless as a bare
+    requests.get(), and nothing leaks between users of a shared WebUI.
+  - Compressed transfer is left to requests / urllib3, which advertise gzip /
+    deflate plus br / zstd when those decoders are installed; loads() parses response
+    bytes directly (orjson when installed, stdlib json otherwise) instead of
+    decoding multi-MB pages to str first.
+  - Every API request (path under /api/) first takes a token from one adaptive
+    limiter (token bucket) shared by all callers and threads:
+      429 / 5xx / timeout  →  rate halved, everyone paused for Retry-After
+                              (or an exponential backoff when the server gives none)
+      success              →  rate creeps back up towards _MAX_RATE
+    so big scans settle at the fastest rate CivitAI accepts, and retry loops
+    simply re-request instead of sleeping on their own. Image CDN fetches and
+    file downloads bypass the limiter and the breaker, so a slow mirror or a
+    CDN error never throttles or trips the API.
+  - A shared CircuitBreaker trips after _BREAKER_THRESHOLD consecutive outage
+    signals (timeouts, connection errors, 5xx): while open, request() raises
+    CircuitOpen at once instead of waiting out timeouts, and callers fall back
+    to cached data. After the cooldown one probe request is let through; its
+    success closes the breaker, its failure doubles the cooldown.
+  - SingleFlight lets concurrent callers asking for the same thing share one
+    in-flight call (request_civit_api coalesces identical API URLs with it).
+  - Two priority lanes share that limiter: requests made inside lane(BACKGROUND)
+    (scans, organize analysis, the download queue, next-page prefetch) yield to
+    INTERACTIVE ones, so a click on a card stays fast during bulk jobs.
+"""
+
+import functools
+import threading
+import time
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+from http.cookiejar import DefaultCookiePolicy
+from urllib.parse import urlparse
+
+import json
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from scripts.civitai_global import print, debug_print
+
+try:
+    import orjson  # Optional — parses API pages several times faster than stdlib json
+except ImportError:
+    orjson = None
+
+_session = None
+_session_lock = threading.Lock()
+
+_POOL_CONNECTIONS = 8   # Hosts kept pooled at the same time
+_POOL_MAXSIZE = 32      # Keep-alive connections per host (parallel scan workers)
+DEFAULT_TIMEOUT = (60, 30)
+
+_START_RATE = 5.0     # Requests per second before any feedback
+_MIN_RATE = 0.5
+_MAX_RATE = 20.0
+_RATE_STEP = 0.05     # Added per successful request (additive increase)
+_BURST = 10
+_BASE_BACKOFF = 2.0   # Pause after the first failure without Retry-After, doubled per failure
+_MAX_BACKOFF = 60.0
+
+THROTTLE_STATUS = (429, 500, 502, 503, 504)
+
+# Priority lanes: UI-triggered calls are INTERACTIVE (default), bulk jobs
+# (scans, organize analysis, download queue, prefetch) run in the BACKGROUND lane
+INTERACTIVE = 0
+BACKGROUND = 1
+_INTERACTIVE_RESERVE = 1  # Tokens background callers never spend
+_lane = threading.local()
+
+OUTAGE_STATUS = (500, 502, 503, 504)
+
+_BREAKER_THRESHOLD = 5      # Consecutive outage signals that open the breaker
+_BREAKER_COOLDOWN = 30.0    # Seconds before the first probe, doubled per failed probe
+_BREAKER_MAX_COOLDOWN = 300.0
+
+
+class Throttled(requests.exceptions.RequestException):
+    """The server asked us to slow down (429 / 503); the limiter is already paused."""
+
+
+class CircuitOpen(requests.exceptions.ConnectionError):
+    """CivitAI is considered down; the request was not sent."""
+
+
+def get_session():
+    """Return the process-wide pooled session, creating it on first use."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=_POOL_CONNECTIONS, pool_maxsize=_POOL_MAXSIZE)
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+                _session = session
+    return _session
+
+
+def is_api_url(url):
+    """True for CivitAI API calls, the only ones paced by the limiter and the breaker."""
+    return urlparse(url).path.startswith('/api/')
+
+
+def request(method, url, **kwargs):
+    """
+    requests.request() on the shared session, with proxy / SSL / timeout defaults
+    applied. API calls wait for the shared limiter first and feed the outcome
+    back to it and to the circuit breaker.
+    """
+    if 'proxies' not in kwargs or 'verify' not in kwargs:
+        # Imported here: the other modules decorate functions with this module's
+        # helpers at import time, so it must not pull them in while loading
+        import scripts.civitai_api as _api
+        proxies, ssl = _api.get_proxies()
+        kwargs.setdefault('proxies', proxies)
+        kwargs.setdefault('verify', ssl)
+    kwargs.setdefault('timeout', DEFAULT_TIMEOUT)
+
+    if not is_api_url(url):
+        return get_session().request(method, url, **kwargs)
+
+    probe = breaker.allow()
+    limiter.acquire(current_priority())
+    try:
+        response = get_session().request(method, url, **kwargs)
+    except (requests.exceptions.Timeout, requests.exceptions.ConnectionError):
+        limiter.throttle()
+        breaker.failure(probe)
+        raise
+    except BaseException:
+        breaker.release(probe)
+        raise
+    if response.status_code in THROTTLE_STATUS:
+        limiter.throttle(retry_after(response))
+    else:
+        limiter.success()
+    if response.status_code in OUTAGE_STATUS:
+        breaker.failure(probe)
+    else:
+        breaker.success()
+    return response
+
+
+def loads(content):
+    """Parse JSON from response bytes (or str) without an intermediate str decode."""
+    if orjson is not None:
+        try:
+            return orjson.loads(content)
+        except orjson.JSONDecodeError:
+            pass  # e.g. integers beyond 64 bits, NaN: let stdlib json decide
+    return json.loads(content)
+
+
+def get(url, **kwargs):
+    return request('GET', url, **kwargs)
+
+
+def post(url, **kwargs):
+    return request('POST', url, **kwargs)
+
+
+def current_priority():
+    """Lane of the calling thread (INTERACTIVE unless inside lane(BACKGROUND))."""
+    return getattr(_lane, 'priority', INTERACTIVE)
+
+
+@contextmanager
+def lane(priority):
+    """Run the requests made by this thread in the given lane."""
+    previous = current_priority()
+    _lane.priority = priority
+    try:
+        yield
+    finally:
+        _lane.priority = previous
+
+
+def background_lane(func):
+    """Decorator for bulk-job entry points: every request they make is BACKGROUND."""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with lane(BACKGROUND):
+            return func(*args, **kwargs)
+    return wrapper
+
+
+def bind_lane(func):
+    """Wrap func to run in the caller's lane on another thread (pool workers)."""
+    priority = current_priority()
+
+    def wrapper(*args, **kwargs):
+        with lane(priority):
+            return func(*args, **kwargs)
+    return wrapper
+
+
+def retry_after(response):
+    """Seconds from a Retry-After header (delta-seconds or HTTP date), or None."""
+    value = (response.headers.get('Retry-After') or '').strip() if response is not None else ''
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError, OverflowError):
+        return None
+
+
+class RateLimiter:
+    """
+    Token bucket shared by threads: acquire() blocks until a request may be sent.
+    With min_rate < max_rate it adapts (AIMD): throttle() halves the rate and pauses
+    every caller, success() adds rate_step back.
+    Two lanes: BACKGROUND callers leave _INTERACTIVE_RESERVE tokens untouched and
+    stand aside while an INTERACTIVE caller is waiting, so UI clicks jump the queue.
+    """
+
+    def __init__(self, rate, burst, min_rate=None, max_rate=None, rate_step=0.0):
+        self.rate = float(rate)       # Tokens added per second
+        self.capacity = float(burst)  # Requests that may go out back-to-back
+        self.min_rate = float(min_rate if min_rate is not None else rate)
+        self.max_rate = float(max_rate if max_rate is not None else rate)
+        self.rate_step = float(rate_step)
+        self._tokens = self.capacity
+        self._stamp = time.monotonic()
+        self._blocked_until = 0.0
+        self._failures = 0
+        self._interactive_waiting = 0
+        self._lock = threading.Lock()
+        self._cond = threading.Condition(self._lock)
+
+    def acquire(self, priority=INTERACTIVE):
+        background = priority == BACKGROUND
+        needed = 1 + (_INTERACTIVE_RESERVE if background else 0)
+        with self._cond:
+            if not background:
+                self._interactive_waiting += 1
+            try:
+                while True:
+                    now = time.monotonic()
+                    if now < self._blocked_until:
+                        delay = self._blocked_until - now
+                    else:
+                        self._tokens = min(self.capacity, self._tokens + (now - max(self._stamp, self._blocked_until)) * self.rate)
+                        self._stamp = now
+                        if background and self._interactive_waiting:
+                            delay = 1 / self.rate
+                        elif self._tokens >= needed:
+                            self._tokens -= 1
+                            return
+                        else:
+                            delay = (needed - self._tokens) / self.rate
+                    self._cond.wait(delay)
+            finally:
+                if not background:
+                    self._interactive_waiting -= 1
+                    self._cond.notify_all()
+
+    def throttle(self, retry_after=None):
+        """Back off after a 429 / 5xx / timeout; retry_after (seconds) overrides the backoff."""
+        with self._lock:
+            now = time.monotonic()
+            # Requests already in flight when the pause began report the same
+            # congestion again: only a longer Retry-After extends the pause then.
+            if now < self._blocked_until:
+                if retry_after is not None:
+                    self._blocked_until = max(self._blocked_until, now + retry_after)
+                return
+            self._failures += 1
+            self.rate = max(self.min_rate, self.rate / 2)
+            if retry_after is None:
+                retry_after = min(_MAX_BACKOFF, _BASE_BACKOFF * 2 ** (self._failures - 1))
+            self._blocked_until = now + retry_after
+            self._tokens = 0.0
+        debug_print(f"Rate limiter: backing off {retry_after:.1f}s, rate now {self.rate:.2f} req/s")
+
+    def success(self):
+        with self._lock:
+            self._failures = 0
+            if self.rate < self.max_rate:
+                self.rate = min(self.max_rate, self.rate + self.rate_step)
+
+    def pause_remaining(self):
+        """Seconds until throttled callers may send again."""
+        with self._lock:
+            return max(0.0, self._blocked_until - time.monotonic())
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls by key: the first caller runs fn(), callers arriving
+    while it is in flight wait and receive the same result (or exception).
+    do() returns (result, shared); shared is True for every caller of a call that
+    had company, so they know to copy mutable results before touching them.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}  # key -> [done Event, result, exception, followers]
+
+    def do(self, key, fn):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = [threading.Event(), None, None, 0]
+                self._calls[key] = call
+            else:
+                call[3] += 1
+
+        if leader:
+            try:
+                call[1] = fn()
+            except BaseException as e:
+                call[2] = e
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call[0].set()
+        else:
+            call[0].wait()
+
+        if call[2] is not None:
+            raise call[2]
+        return call[1], call[3] > 0
+
+
+class CircuitBreaker:
+    """
+    closed     →  requests pass; consecutive failures are counted
+    open       →  allow() raises CircuitOpen until the cooldown ends
+    half-open  →  a single probe passes (others keep failing fast); success closes,
+                  failure re-opens with a doubled cooldown
+    """
+
+    def __init__(self, threshold, cooldown, max_cooldown):
+        self.threshold = threshold
+        self.base_cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self._cooldown = cooldown
+        self._failures = 0
+        self._open_until = None  # None = closed
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def is_open(self):
+        with self._lock:
+            return self._open_until is not None
+
+    def allow(self):
+        """Raise CircuitOpen if requests must not be sent; returns True for the probe."""
+        with self._lock:
+            if self._open_until is None:
+                return False
+            if time.monotonic() >= self._open_until and not self._probing:
+                self._probing = True
+                debug_print('Circuit breaker: probing CivitAI')
+                return True
+            raise CircuitOpen('CivitAI appears to be offline, request skipped (circuit breaker open)')
+
+    def success(self):
+        with self._lock:
+            if self._open_until is not None:
+                print('CivitAI is reachable again.')
+            self._failures = 0
+            self._open_until = None
+            self._probing = False
+            self._cooldown = self.base_cooldown
+
+    def failure(self, probe=False):
+        with self._lock:
+            if probe:
+                self._probing = False
+                self._cooldown = min(self.max_cooldown, self._cooldown * 2)
+                self._open_until = time.monotonic() + self._cooldown
+                return
+            self._failures += 1
+            if self._open_until is None and self._failures >= self.threshold:
+                self._open_until = time.monotonic() + self._cooldown
+                print(f"CivitAI did not respond {self._failures} times in a row, pausing requests for {self._cooldown:.0f}s.")
+
+    def release(self, probe):
+        """A probe that ended without an answer either way (e.g. cancelled)."""
+        if probe:
+            with self._lock:
+                self._probing = False
+
+
+# Shared by every API request() of the extension
+breaker = CircuitBreaker(_BREAKER_THRESHOLD, _BREAKER_COOLDOWN, _BREAKER_MAX_COOLDOWN)
+limiter = RateLimiter(_START_RATE, _BURST, min_rate=_MIN_RATE, max_rate=_MAX_RATE, rate_step=_RATE_STEP)
@@ -0,0 +1,608 @@
+"""
+Local Model Index  —  neo_model_index.db
+
+Persistent SQLite index of every file found under the model folders, so the
+browser can answer "is this installed?" without walking the whole tree and
+json-loading every sidecar on every click.
+
+One row per file:
+  path, dir, name, size, mtime            (any file — model, preview, sidecar…)
+  sha256, model_id, version_id            (only filled for .json sidecars)
+
+One row per directory:
+  path, parent, mtime_ns                  (used for change tracking)
+
+One row per hashed file (content-hash cache):
+  dev, ino, size, mtime_ns  →  sha256     (stat identity, survives renames/moves
+                               digests     inside one filesystem; digests holds the
+                               fingerprint other CivitAI hash types as JSON)
+  A quick fingerprint (size + head/middle/tail block hash) recognises the same
+  content under a new identity — copies and cross-device moves that keep the
+  mtime (small files are fingerprinted whole and match on content alone).
+
+Change tracking:
+  - A root folder is fully swept once per session (only sidecars whose
+    size/mtime changed since the last run are re-read).
+  - After that, only changed directories are re-listed:
+      watchdog installed  →  filesystem events (inotify / FSEvents / ReadDirectoryChangesW)
+                             mark directories dirty as they change
+      fallback            →  stat every known directory and re-list the ones
+                             whose mtime moved (add / remove / rename)
+  - In-place edits don't touch the directory mtime. Sidecars (.json) are
+    re-stat'ed with every directory mtime diff (the watcher reports them as
+    'modified' events), so hash/ID lookups see an outside sidecar edit within
+    _CHECK_INTERVAL. Every other known file is re-stat'ed (no reads) at most
+    once per _VERIFY_INTERVAL — an in-place edit of a model or preview can stay
+    unseen that long, which only affects size/mtime, never what is installed.
+  - The extension's own writes (sidecar saves via safe_json_save, deletes,
+    organize moves) call refresh_dir()/refresh_path() directly, so they are
+    visible immediately.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from scripts.civitai_global import print, debug_print
+
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+except ImportError:
+    Observer = None
+    FileSystemEventHandler = object
+
+_DB_FILE = None  # Resolved lazily to survive module-level import order
+_conn = None
+_lock = threading.RLock()
+_synced_roots = set()   # Roots swept during this session
+_last_check = {}        # root -> time of last directory mtime diff
+_last_verify = {}       # root -> time of last full stat verification
+_watchers = {}          # root -> watchdog Observer
+_dirty_dirs = set()     # Directories reported by the watcher, drained on next query
+_dirty_lock = threading.Lock()
+
+_CHECK_INTERVAL = 2.0     # Seconds between directory mtime diffs of the same root
+_VERIFY_INTERVAL = 300.0  # Seconds between stat verifications catching in-place edits
+
+MODEL_EXTENSIONS = ('.pt', '.ckpt', '.pth', '.safetensors', '.th', '.zip', '.vae', '.bin')
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS files (
+    path       TEXT PRIMARY KEY,
+    dir        TEXT NOT NULL,
+    name       TEXT NOT NULL,
+    name_lower TEXT NOT NULL,
+    size       INTEGER NOT NULL,
+    mtime      REAL NOT NULL,
+    sha256     TEXT,
+    model_id   INTEGER,
+    version_id INTEGER
+);
+CREATE INDEX IF NOT EXISTS files_dir    ON files (dir);
+CREATE INDEX IF NOT EXISTS files_name   ON files (name_lower);
+CREATE INDEX IF NOT EXISTS files_sha256 ON files (sha256);
+CREATE TABLE IF NOT EXISTS dirs (
+    path     TEXT PRIMARY KEY,
+    parent   TEXT,
+    mtime_ns INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS dirs_parent ON dirs (parent);
+CREATE TABLE IF NOT EXISTS hashes (
+    dev      INTEGER NOT NULL,
+    ino      INTEGER NOT NULL,
+    size     INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    sha256   TEXT NOT NULL,
+    path     TEXT,
+    digests  TEXT,
+    fingerprint TEXT,
+    PRIMARY KEY (dev, ino)
+);
+'''
+
+
+def _get_db_path():
+    global _DB_FILE
+    if _DB_FILE is None:
+        config_folder = os.path.join(os.getcwd(), 'config_states')
+        os.makedirs(config_folder, exist_ok=True)
+        _DB_FILE = os.path.join(config_folder, 'neo_model_index.db')
+    return _DB_FILE
+
+
+def _get_conn():
+    global _conn
+    if _conn is None:
+        _conn = sqlite3.connect(_get_db_path(), check_same_thread=False)
+        _conn.execute('PRAGMA journal_mode=WAL')
+        _conn.execute('PRAGMA synchronous=NORMAL')
+        _conn.executescript(_SCHEMA)
+        _migrate(_conn)
+    return _conn
+
+
+def _migrate(conn):
+    """Add columns introduced after a database was first created."""
+    columns = {row[1] for row in conn.execute('PRAGMA table_info(hashes)')}
+    if 'digests' not in columns:
+        conn.execute('ALTER TABLE hashes ADD COLUMN digests TEXT')
+    if 'fingerprint' not in columns:
+        conn.execute('ALTER TABLE hashes ADD COLUMN fingerprint TEXT')
+    conn.execute('CREATE INDEX IF NOT EXISTS hashes_fingerprint ON hashes (fingerprint)')
+    conn.commit()
+
+
+def _norm(path):
+    return os.path.abspath(str(path))
+
+
+def _under(root, column='dir'):
+    """SQL fragment + params matching rows whose `column` is root or below it."""
+    return (
+        f'({column} = ? OR ({column} >= ? AND {column} < ?))',
+        (root, root + os.sep, root + chr(ord(os.sep) + 1)),
+    )
+
+
+def _read_sidecar(path):
+    """Return (sha256, model_id, version_id) from a .json sidecar, or Nones."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except Exception:
+        return None, None, None
+    if not isinstance(data, dict):
+        return None, None, None
+    sha256 = data.get('sha256')
+    sha256 = sha256.strip().upper() if isinstance(sha256, str) and sha256.strip() else None
+    model_id = data.get('modelId')
+    version_id = data.get('modelVersionId')
+    return (
+        sha256,
+        model_id if isinstance(model_id, int) else None,
+        version_id if isinstance(version_id, int) else None,
+    )
+
+
+def _row_for(path, directory, name, st, known):
+    """Build an upsert row for a file, or None when the indexed row is still current."""
+    prev = known.get(path)
+    if prev is not None and prev == (st.st_size, st.st_mtime):
+        return None
+    sha256 = model_id = version_id = None
+    if name.lower().endswith('.json'):
+        sha256, model_id, version_id = _read_sidecar(path)
+    return (path, directory, name, name.lower(), st.st_size, st.st_mtime, sha256, model_id, version_id)
+
+
+def _scan_dir(directory):
+    """List one directory: returns ([(name, stat)], [subdir paths])."""
+    files, subdirs = [], []
+    try:
+        with os.scandir(directory) as it:
+            for entry in it:
+                try:
+                    if entry.is_dir(follow_symlinks=True):
+                        subdirs.append(entry.path)
+                    elif entry.is_file(follow_symlinks=True):
+                        files.append((entry.name, entry.stat(follow_symlinks=True)))
+                except OSError:
+                    continue
+    except OSError:
+        pass
+    return files, subdirs
+
+
+_UPSERT = 'INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)'
+
+
+# ─── Directory-level upkeep ───────────────────────────────────────────────────
+
+def _drop_tree(conn, directory):
+    """Remove every file and directory row at or below `directory`."""
+    clause, params = _under(directory)
+    conn.execute(f'DELETE FROM files WHERE {clause}', params)
+    clause, params = _under(directory, 'path')
+    conn.execute(f'DELETE FROM dirs WHERE {clause}', params)
+
+
+def _index_dir(conn, directory):
+    """Re-list one directory and apply the differences to the index.
+    Returns (all subdirectories, subdirectories that were not known before)."""
+    try:
+        dir_mtime = os.stat(directory).st_mtime_ns
+    except OSError:
+        _drop_tree(conn, directory)
+        return [], []
+    known = {p: (s, m) for p, s, m in conn.execute('SELECT path, size, mtime FROM files WHERE dir = ?', (directory,))}
+    known_subdirs = {r[0] for r in conn.execute('SELECT path FROM dirs WHERE parent = ?', (directory,))}
+    files, subdirs = _scan_dir(directory)
+    seen = set()
+    upserts = []
+    for name, st in files:
+        path = os.path.join(directory, name)
+        seen.add(path)
+        row = _row_for(path, directory, name, st, known)
+        if row:
+            upserts.append(row)
+    conn.executemany(_UPSERT, upserts)
+    conn.executemany('DELETE FROM files WHERE path = ?', [(p,) for p in known.keys() - seen])
+    for gone in known_subdirs - set(subdirs):
+        _drop_tree(conn, gone)
+    parent = os.path.dirname(directory)
+    conn.execute('INSERT OR REPLACE INTO dirs VALUES (?, ?, ?)', (directory, parent, dir_mtime))
+    return subdirs, [d for d in subdirs if d not in known_subdirs]
+
+
+def _sweep_tree(conn, top, visited):
+    """Index `top` and everything below it. `visited` collects real paths (symlink loop guard)."""
+    stack = [top]
+    while stack:
+        directory = stack.pop()
+        real = os.path.realpath(directory)
+        if real in visited:
+            continue
+        visited.add(real)
+        stack.extend(_index_dir(conn, directory)[0])
+
+
+def _sweep_root(root):
+    """Walk a root folder and bring its rows up to date (first use in a session)."""
+    conn = _get_conn()
+    visited = set()
+    with conn:
+        _sweep_tree(conn, root, visited)
+        # Rows for directories that vanished while the extension was not running
+        clause, params = _under(root, 'path')
+        stale = [p for (p,) in conn.execute(f'SELECT path FROM dirs WHERE {clause}', params)
+                 if os.path.realpath(p) not in visited]
+        for directory in stale:
+            _drop_tree(conn, directory)
+        clause, params = _under(root)
+        orphans = conn.execute(
+            f'SELECT DISTINCT dir FROM files WHERE {clause} AND dir NOT IN (SELECT path FROM dirs)', params
+        ).fetchall()
+        for (directory,) in orphans:
+            conn.execute('DELETE FROM files WHERE dir = ?', (directory,))
+    debug_print(f"Model index: swept {root} ({len(visited)} folders)")
+
+
+def _apply_changes(root, directories):
+    """Re-list the given directories, sweeping any subdirectory that appeared."""
+    conn = _get_conn()
+    with conn:
+        for directory in directories:
+            visited = set()
+            for new_dir in _index_dir(conn, directory)[1]:
+                _sweep_tree(conn, new_dir, visited)
+    if directories:
+        debug_print(f"Model index: refreshed {len(directories)} changed folder(s) under {root}")
+
+
+def _changed_dirs(root, verify):
+    """Directory mtime diff: return known directories under root that changed.
+    With verify=True every known directory is returned (files get re-stat'ed).
+    Sidecars are re-stat'ed too, since an in-place .json edit leaves the
+    directory mtime alone but changes what sidecar_hashes() reports."""
+    conn = _get_conn()
+    clause, params = _under(root, 'path')
+    changed = []
+    for path, mtime_ns in conn.execute(f'SELECT path, mtime_ns FROM dirs WHERE {clause}', params).fetchall():
+        if verify:
+            changed.append(path)
+            continue
+        try:
+            if os.stat(path).st_mtime_ns != mtime_ns:
+                changed.append(path)
+        except OSError:
+            changed.append(path)
+    if verify:
+        return changed
+    return sorted(set(changed) | set(_changed_sidecar_dirs(conn, root)))
+
+
+def _changed_sidecar_dirs(conn, root):
+    """Directories under root holding a .json sidecar whose size/mtime moved."""
+    clause, params = _under(root)
+    changed = set()
+    rows = conn.execute(
+        f"SELECT dir, path, size, mtime FROM files WHERE {clause} AND name_lower LIKE '%.json'", params
+    ).fetchall()
+    for directory, path, size, mtime in rows:
+        if directory in changed:
+            continue
+        try:
+            st = os.stat(path)
+        except OSError:
+            changed.add(directory)
+            continue
+        if (st.st_size, st.st_mtime) != (size, mtime):
+            changed.add(directory)
+    return changed
+
+
+# ─── Filesystem watcher (optional: watchdog) ──────────────────────────────────
+
+class _DirtyHandler(FileSystemEventHandler):
+    """Marks the directories touched by each filesystem event as dirty."""
+
+    def on_any_event(self, event):
+        if event.event_type not in ('created', 'deleted', 'modified', 'moved'):
+            return
+        paths = [getattr(event, 'src_path', None), getattr(event, 'dest_path', None)]
+        with _dirty_lock:
+            for path in paths:
+                if not path:
+                    continue
+                path = os.fsdecode(path)
+                _dirty_dirs.add(os.path.dirname(path))
+                if event.is_directory:
+                    _dirty_dirs.add(path)
+
+
+def _start_watcher(root):
+    if Observer is None or root in _watchers:
+        return
+    try:
+        observer = Observer()
+        observer.daemon = True
+        observer.schedule(_DirtyHandler(), root, recursive=True)
+        observer.start()
+        _watchers[root] = observer
+        debug_print(f"Model index: watching {root}")
+    except Exception as e:
+        debug_print(f"Model index: could not watch {root}, using mtime diff ({e})")
+
+
+def _drain_dirty(root):
+    prefix = root + os.sep
+    with _dirty_lock:
+        mine = {d for d in _dirty_dirs if d == root or d.startswith(prefix)}
+        _dirty_dirs.difference_update(mine)
+    return sorted(mine)
+
+
+def _update_root(root):
+    """Bring a previously swept root up to date, touching only what changed."""
+    now = time.monotonic()
+    verify = now - _last_verify.get(root, now) >= _VERIFY_INTERVAL
+    if root in _watchers:
+        changed = _drain_dirty(root)
+        if verify:
+            changed = sorted(set(changed) | set(_changed_dirs(root, True)))
+    else:
+        if not verify and now - _last_check.get(root, 0) < _CHECK_INTERVAL:
+            return
+        changed = _changed_dirs(root, verify)
+        _last_check[root] = now
+    if verify:
+        _last_verify[root] = now
+    _apply_changes(root, changed)
+
+
+# ─── Maintenance ──────────────────────────────────────────────────────────────
+
+def ensure(folders):
+    """Make sure the index is current for every folder in `folders`.
+    First use in a session sweeps the folder; later calls refresh only changed directories.
+    Returns the list of normalized roots (None / missing folders are skipped)."""
+    roots = []
+    for folder in folders:
+        if folder is None:
+            continue
+        root = _norm(folder)
+        if not os.path.isdir(root):
+            continue
+        roots.append(root)
+    with _lock:
+        for root in roots:
+            try:
+                if root in _synced_roots:
+                    _update_root(root)
+                    continue
+                _start_watcher(root)
+                _sweep_root(root)
+                _synced_roots.add(root)
+                _last_check[root] = _last_verify[root] = time.monotonic()
+                _drain_dirty(root)
+            except sqlite3.Error as e:
+                print(f"Model index update failed for {root}: {e}")
+    return roots
+
+
+def refresh_dir(directory):
+    """Re-index a single directory after the extension changed it.
+    Directories outside any swept root are ignored — they are picked up on first use."""
+    if not directory:
+        return
+    directory = _norm(directory)
+    with _lock:
+        root = next((r for r in _synced_roots if directory == r or directory.startswith(r + os.sep)), None)
+        if root is None:
+            return
+        try:
+            _apply_changes(root, [directory])
+        except sqlite3.Error as e:
+            print(f"Model index refresh failed for {directory}: {e}")
+
+
+def refresh_path(file_path):
+    """Re-index the directory containing `file_path`."""
+    if file_path:
+        refresh_dir(os.path.dirname(_norm(file_path)))
+
+
+def reset():
+    """Forget what was swept this session so the next query re-validates every root."""
+    with _lock:
+        _synced_roots.clear()
+        _last_check.clear()
+        _last_verify.clear()
+
+
+# ─── Queries ──────────────────────────────────────────────────────────────────
+
+def _query(folders, where, params=()):
+    roots = ensure(folders)
+    if not roots:
+        return []
+    rows = []
+    with _lock:
+        conn = _get_conn()
+        for root in roots:
+            clause, root_params = _under(root)
+            rows.extend(conn.execute(
+                f'SELECT dir, name, sha256, model_id, version_id FROM files WHERE {clause} AND {where}',
+                root_params + tuple(params),
+            ).fetchall())
+    return rows
+
+
+def existing_files(folders):
+    """Return (lowercase filenames, uppercase sidecar SHA256s) found under `folders`."""
+    names = set()
+    hashes = set()
+    roots = ensure(folders)
+    with _lock:
+        conn = _get_conn()
+        for root in roots:
+            clause, params = _under(root)
+            for name_lower, sha256 in conn.execute(f'SELECT name_lower, sha256 FROM files WHERE {clause}', params):
+                names.add(name_lower)
+                if sha256:
+                    hashes.add(sha256)
+    return names, hashes
+
+
+def sidecar_hashes(folders):
+    """Return the set of uppercase SHA256 values recorded in sidecars under `folders`."""
+    return {row[2] for row in _query(folders, 'sha256 IS NOT NULL')}
+
+
+def find_by_sha256(folders, sha256):
+    """Return [(dir, sidecar_name)] for sidecars whose sha256 matches."""
+    if not sha256:
+        return []
+    return [(row[0], row[1]) for row in _query(folders, 'sha256 = ?', (sha256.strip().upper(),))]
+
+
+def find_by_name(folders, names):
+    """Return [(dir, name)] for files whose lowercase name is in `names`."""
+    names = [n.lower() for n in names if n]
+    if not names:
+        return []
+    placeholders = ', '.join('?' * len(names))
+    return [(row[0], row[1]) for row in _query(folders, f'name_lower IN ({placeholders})', names)]
+
+
+def list_dir(directory):
+    """Return the indexed file names in one directory."""
+    directory = _norm(directory)
+    with _lock:
+        return [r[0] for r in _get_conn().execute('SELECT name FROM files WHERE dir = ?', (directory,))]
+
+
+def find_model_file(directory, sidecar_name, extensions=MODEL_EXTENSIONS):
+    """Return the model file sharing the sidecar's base name in `directory`, or None."""
+    base_name = os.path.splitext(sidecar_name)[0]
+    for name in list_dir(directory):
+        stem, ext = os.path.splitext(name)
+        if stem == base_name and ext.lower() in extensions:
+            return name
+    return None
+
+
+# ─── Content-hash cache ───────────────────────────────────────────────────────
+
+def _stat_identity(file_path):
+    """Return (dev, ino, size, mtime_ns) for a file, or None when it can't be trusted."""
+    try:
+        st = os.stat(os.path.realpath(file_path))
+    except OSError:
+        return None
+    if not st.st_ino:  # Some network / FAT mounts report no inode numbers
+        return None
+    return st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns
+
+
+def _row_digests(sha256, digests_json):
+    digests = {}
+    if digests_json:
+        try:
+            digests = json.loads(digests_json)
+        except ValueError:
+            digests = {}
+    digests['SHA256'] = sha256.upper()
+    return digests
+
+
+def lookup_hashes(file_path):
+    """Return the cached digests for `file_path` if its stat identity is unchanged.
+    Result: {'SHA256': ..., 'AutoV2': ..., 'CRC32': ..., 'BLAKE3': ...} (uppercase) or None."""
+    identity = _stat_identity(file_path)
+    if identity is None:
+        return None
+    dev, ino, size, mtime_ns = identity
+    path = _norm(file_path)
+    with _lock:
+        try:
+            conn = _get_conn()
+            row = conn.execute(
+                'SELECT sha256, path, digests FROM hashes WHERE dev = ? AND ino = ? AND size = ? AND mtime_ns = ?',
+                (dev, ino, size, mtime_ns),
+            ).fetchone()
+            if row and row[1] != path:  # Renamed / moved — remember where it lives now
+                with conn:
+                    conn.execute('UPDATE hashes SET path = ? WHERE dev = ? AND ino = ?', (path, dev, ino))
+        except sqlite3.Error as e:
+            debug_print(f"Hash cache lookup failed for {file_path}: {e}")
+            return None
+    return _row_digests(row[0], row[2]) if row else None
+
+
+def lookup_fingerprint(fingerprint, mtime_ns=None):
+    """Return the digests of any cached file with the same quick fingerprint, or None.
+    With `mtime_ns`, only entries recorded with that exact mtime match (sampled
+    fingerprints don't cover the whole file)."""
+    if not fingerprint:
+        return None
+    query = 'SELECT sha256, digests FROM hashes WHERE fingerprint = ?'
+    params = (fingerprint,)
+    if mtime_ns is not None:
+        query += ' AND mtime_ns = ?'
+        params += (mtime_ns,)
+    with _lock:
+        try:
+            row = _get_conn().execute(query + ' LIMIT 1', params).fetchone()
+        except sqlite3.Error as e:
+            debug_print(f"Hash cache fingerprint lookup failed: {e}")
+            return None
+    return _row_digests(row[0], row[1]) if row else None
+
+
+def lookup_hash(file_path):
+    """Return the cached lowercase SHA256 for `file_path` if its stat identity is unchanged."""
+    digests = lookup_hashes(file_path)
+    return digests['SHA256'].lower() if digests else None
+
+
+def store_hash(file_path, sha256, digests=None, fingerprint=None):
+    """Remember the SHA256 (and optionally the other digests / quick fingerprint)
+    of `file_path` under its current stat identity."""
+    identity = _stat_identity(file_path)
+    if identity is None or not sha256:
+        return
+    extra = {k: v for k, v in (digests or {}).items() if k != 'SHA256' and v}
+    with _lock:
+        try:
+            conn = _get_conn()
+            with conn:
+                conn.execute(
+                    'INSERT OR REPLACE INTO hashes VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                    identity + (sha256.strip().lower(), _norm(file_path), json.dumps(extra) if extra else None, fingerprint),
+                )
+        except sqlite3.Error as e:
+            debug_print(f"Hash cache store failed for {file_path}: {e}")
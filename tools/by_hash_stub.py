@@ -0,0 +1,215 @@
+"""
+Local stand-in for the CivitAI by-hash endpoints, for offline benchmarks of
+scripts/by_hash_batch.py.
+
+  GET  /api/v1/model-versions/by-hash/{sha256}   one version, or 404
+  POST /api/v1/model-versions/by-hash            JSON list of hashes → list of versions
+
+Every valid SHA256 resolves to a deterministic fake version, except hashes
+starting with '0' (404 / left out of batch results). --latency adds a fixed
+delay per request, --no-batch answers the POST with 405.
+
+Usage (from the repository root):
+  python tools/by_hash_stub.py --port 8765                 serve until Ctrl+C
+  python tools/by_hash_stub.py --bench 2000 --threads 8    serve in-process and
+                                                           compare per-hash GETs
+                                                           with the batching client
+  python tools/by_hash_stub.py --bench 200 --rate 5        same, under the extension's
+                                                           by-hash request rate
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from scripts.by_hash_batch import BY_HASH_PATH, ByHashBatcher
+
+_SHA_RE = re.compile(r'^[0-9A-Fa-f]{64}$')
+
+
+def fake_version(sha256):
+    sha = sha256.upper()
+    version_id = int(sha[:8], 16)
+    return {
+        'id': version_id,
+        'modelId': version_id // 7,
+        'name': f"v{version_id % 10}.0",
+        'baseModel': 'SDXL 1.0',
+        'files': [{
+            'name': f"model_{sha[:8].lower()}.safetensors",
+            'hashes': {'SHA256': sha, 'AutoV2': sha[:10]},
+            'downloadUrl': f"https://civitai.com/api/download/models/{version_id}",
+        }],
+    }
+
+
+def _exists(sha256):
+    return bool(_SHA_RE.match(sha256)) and not sha256.startswith('0')
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    latency = 0.0
+    batch = True
+    requests_served = 0
+    _count_lock = threading.Lock()
+
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, status, payload):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _served(self):
+        with StubHandler._count_lock:
+            StubHandler.requests_served += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def do_GET(self):
+        self._served()
+        prefix = BY_HASH_PATH + '/'
+        if not self.path.startswith(prefix):
+            return self._reply(404, {'error': 'Not found'})
+        sha = self.path[len(prefix):].split('?', 1)[0]
+        if not _exists(sha):
+            return self._reply(404, {'error': f"Model not found for hash {sha}"})
+        self._reply(200, fake_version(sha))
+
+    def do_POST(self):
+        self._served()
+        length = int(self.headers.get('Content-Length', 0))
+        raw = self.rfile.read(length) if length else b''
+        if self.path.split('?', 1)[0] != BY_HASH_PATH:
+            return self._reply(404, {'error': 'Not found'})
+        if not self.batch:
+            return self._reply(405, {'error': 'Method not allowed'})
+        try:
+            hashes = json.loads(raw or b'[]')
+        except ValueError:
+            return self._reply(400, {'error': 'Invalid JSON'})
+        if not isinstance(hashes, list):
+            return self._reply(400, {'error': 'Expected a list of hashes'})
+        self._reply(200, [fake_version(h) for h in hashes if isinstance(h, str) and _exists(h)])
+
+
+def serve(port=0, latency=0.0, batch=True):
+    """Start the stub on a background thread; returns (server, base_url)."""
+    StubHandler.latency = latency
+    StubHandler.batch = batch
+    server = ThreadingHTTPServer(('127.0.0.1', port), StubHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+# ─── Benchmark ────────────────────────────────────────────────────────────────
+
+class _Response:
+    def __init__(self, status_code, body):
+        self.status_code = status_code
+        self._body = body
+
+    def json(self):
+        return json.loads(self._body)
+
+
+def urllib_send(method, url, headers=None, timeout=None, **kwargs):
+    """Minimal send() for ByHashBatcher without requests installed."""
+    data = None
+    headers = dict(headers or {})
+    if kwargs.get('json') is not None:
+        data = json.dumps(kwargs['json']).encode('utf-8')
+        headers['Content-Type'] = 'application/json'
+    if isinstance(timeout, tuple):
+        timeout = timeout[1]
+    request = urllib.request.Request(url, data=data, headers=headers, method=method)
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return _Response(response.status, response.read())
+    except urllib.error.HTTPError as e:
+        return _Response(e.code, e.read())
+
+
+def _run(label, lookup, hashes, threads):
+    served = StubHandler.requests_served
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        results = list(pool.map(lookup, hashes))
+    elapsed = time.perf_counter() - start
+    found = sum(1 for status, _ in results if status == 200)
+    print(f"{label:<22} {len(hashes)} lookups in {elapsed:.2f}s "
+          f"({len(hashes) / elapsed:.0f}/s), {StubHandler.requests_served - served} requests, {found} found")
+    return results
+
+
+def rate_limited(send, rate):
+    """Wrap send() so requests start at most `rate` per second (like the extension's limiter)."""
+    lock = threading.Lock()
+    next_slot = [time.monotonic()]
+
+    def _send(method, url, **kwargs):
+        with lock:
+            now = time.monotonic()
+            start = max(now, next_slot[0])
+            next_slot[0] = start + 1.0 / rate
+        time.sleep(max(0.0, start - now))
+        return send(method, url, **kwargs)
+    return _send
+
+
+def bench(count, threads, latency, batch, rate):
+    server, base_url = serve(latency=latency, batch=batch)
+    hashes = [hashlib.sha256(str(i).encode()).hexdigest() for i in range(count)]
+
+    send = rate_limited(urllib_send, rate) if rate else urllib_send
+    single = ByHashBatcher(send, max_batch=1)
+    batched = ByHashBatcher(send)
+    a = _run('per-hash GET', lambda h: single.lookup(base_url, h, timeout=30), hashes, threads)
+    b = _run('batched', lambda h: batched.lookup(base_url, h, timeout=30), hashes, threads)
+
+    mismatches = sum(1 for (sa, da), (sb, db) in zip(a, b) if sa != sb or (da or {}).get('id') != (db or {}).get('id'))
+    print(f"mismatching results: {mismatches}")
+    server.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds added to every request')
+    parser.add_argument('--no-batch', action='store_true', help='reject the batch POST with 405')
+    parser.add_argument('--bench', type=int, default=0, metavar='N', help='benchmark N lookups and exit')
+    parser.add_argument('--threads', type=int, default=8, help='concurrent callers in --bench mode')
+    parser.add_argument('--rate', type=float, default=0.0, help='requests per second allowed in --bench mode (0 = unlimited)')
+    args = parser.parse_args()
+
+    if args.bench:
+        bench(args.bench, args.threads, args.latency, not args.no_batch, args.rate)
+        return
+
+    server, base_url = serve(args.port, args.latency, not args.no_batch)
+    print(f"By-hash stub listening on {base_url}{BY_HASH_PATH}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()